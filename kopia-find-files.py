@@ -57,6 +57,10 @@ EXIT_TOOL_ERROR = 1
 EXIT_CONFIG_ERROR = 2
 EXIT_NO_RESULTS = 3
 
+# kopia ls -l line, compiled once (parse_ls_line runs per listed file).
+# Groups: perms, size, date, time, tz, hash, path
+_LS_LINE_RE = re.compile(r"^([d-][rwx-]{9})\s+(\d+)\s+(\d{4}-\d{2}-\d{2})\s+(\d{2}:\d{2}:\d{2})\s+(\w+)\s+([a-f0-9]+)\s+(.+)$")
+
 
 def parse_ls_line(line: str) -> Optional[Tuple[int, str, str]]:
     """Parse a kopia ls -l --no-human-readable line.
@@ -66,16 +70,7 @@ def parse_ls_line(line: str) -> Optional[Tuple[int, str, str]]:
 
     Returns (size, modified_str, path) or None if parse fails or is a directory.
     """
-    # Regex to parse the line
-    # Group 1: perms
-    # Group 2: size
-    # Group 3: date
-    # Group 4: time
-    # Group 5: tz
-    # Group 6: hash
-    # Group 7: path
-    pattern = r"^([d-][rwx-]{9})\s+(\d+)\s+(\d{4}-\d{2}-\d{2})\s+(\d{2}:\d{2}:\d{2})\s+(\w+)\s+([a-f0-9]+)\s+(.+)$"
-    match = re.match(pattern, line.strip())
+    match = _LS_LINE_RE.match(line.strip())
 
     if not match:
         return None
@@ -59,6 +59,14 @@ TASK_NAME = "KopiaHelperHealth"
 # Set from config at runtime
 aggregated_dirs: List[str] = []
 
+# kopia diff line patterns, compiled once (parse_diff_line runs per output line)
+# changed ./path at 2025-11-22 16:09:30.2325872 +1100 AEDT (size 11258 -> 12051)
+_DIFF_CHANGED_RE = re.compile(r"^changed\s+(.+?)\s+at\s+(.+?)(?:\s+\(size\s+(.+?)\))?$")
+# added file ./path (1234 bytes)
+_DIFF_ADDED_RE = re.compile(r"^added file\s+(.+?)\s+\((\d+)\s+bytes\)$")
+# removed file ./path
+_DIFF_REMOVED_RE = re.compile(r"^removed file\s+(.+)$")
+
 
 def parse_diff_line(line: str) -> Optional[Tuple[str, str, str]]:
     """Parse a kopia diff line. Returns (change_type, path, formatted_line) or None."""
@@ -68,19 +76,7 @@ def parse_diff_line(line: str) -> Optional[Tuple[str, str, str]]:
 
     BLANK_TS = ' ' * 25
 
-    # Regex for "changed" lines
-    # changed ./path at 2025-11-22 16:09:30.2325872 +1100 AEDT (size 11258 -> 12051)
-    changed_pattern = r"^changed\s+(.+?)\s+at\s+(.+?)(?:\s+\(size\s+(.+?)\))?$"
-    
-    # Regex for "added file" lines
-    # added file ./path (1234 bytes)
-    added_pattern = r"^added file\s+(.+?)\s+\((\d+)\s+bytes\)$"
-    
-    # Regex for "removed file" lines
-    # removed file ./path
-    removed_pattern = r"^removed file\s+(.+)$"
-
-    match_changed = re.match(changed_pattern, line)
+    match_changed = _DIFF_CHANGED_RE.match(line)
     if match_changed:
         path = match_changed.group(1)
         ts_part = match_changed.group(2)
@@ -91,13 +87,13 @@ def parse_diff_line(line: str) -> Optional[Tuple[str, str, str]]:
         
         return ('changed', path, f"      c {ts} | {size_str:15s} | {path}")
 
-    match_added = re.match(added_pattern, line)
+    match_added = _DIFF_ADDED_RE.match(line)
     if match_added:
         path = match_added.group(1)
         size = match_added.group(2)
         return ('added', path, f"      + {BLANK_TS} | {size:15s} | {path}")
 
-    match_removed = re.match(removed_pattern, line)
+    match_removed = _DIFF_REMOVED_RE.match(line)
     if match_removed:
         path = match_removed.group(1)
         return ('removed', path, f"      - {BLANK_TS} | {' ':15s} | {path}")
@@ -330,13 +326,12 @@ def show_detailed_status(runner: utils.KopiaRunner, repo_config: Dict[str, Any],
     print(f"\n{'='*20} {name} {'='*20}")
     print(f"Local Repository: {repo_path}")
     if utils.has_remote_destination(repo_config):
-        cloud_status = utils.load_cloud_sync_status()
+        repo_sync_status = utils.get_repo_sync_status(name)
         sync_runner = utils.KopiaSyncRunner()
 
         for dest_config in repo_config.get('sync-to', []):
             dest_id = sync_runner.get_destination_id(dest_config)
-            key = f"{name}:{dest_id}"
-            dest_status = cloud_status.get(key, {})
+            dest_status = repo_sync_status.get(dest_id, {})
 
             if dest_status:
                 if not dest_status.get('success', True):
@@ -529,12 +524,11 @@ $toast = [Windows.UI.Notifications.ToastNotification]::new($xml)
 [Windows.UI.Notifications.ToastNotificationManager]::CreateToastNotifier("Kopia Backup").Show($toast)
 '''
     try:
-        creation_flags = 0x08000000 if sys.platform == "win32" else 0  # CREATE_NO_WINDOW
         result = subprocess.run(
             ["powershell", "-ExecutionPolicy", "Bypass", "-Command", ps_script],
             capture_output=True,
             text=True,
-            creationflags=creation_flags
+            **utils.NO_WINDOW
         )
         if result.returncode != 0:
             print(f"Toast failed: {result.stderr}")
@@ -560,13 +554,12 @@ def diagnose_rclone_issues(dest_id: str) -> List[str]:
 
     # Check 1: Is rclone in PATH?
     try:
-        creation_flags = 0x08000000 if sys.platform == "win32" else 0
         result = subprocess.run(
             [utils.RCLONE_EXE, "version"],
             capture_output=True,
             text=True,
             timeout=10,
-            creationflags=creation_flags
+            **utils.NO_WINDOW
         )
         if result.returncode == 0:
             version_line = result.stdout.strip().split('\n')[0]
@@ -591,10 +584,10 @@ def diagnose_rclone_issues(dest_id: str) -> List[str]:
             capture_output=True,
             text=True,
             timeout=10,
-            creationflags=creation_flags
+            **utils.NO_WINDOW
         )
         if result.returncode == 0:
-            remotes = [r.rstrip(':') for r in result.stdout.strip().split('\n') if r]
+            remotes = [r[:-1] for r in result.stdout.splitlines() if r.endswith(':')]
             if remote_name in remotes:
                 diagnostics.append(f"  remote '{remote_name}': configured")
             else:
@@ -620,7 +613,7 @@ def diagnose_rclone_issues(dest_id: str) -> List[str]:
             capture_output=True,
             text=True,
             timeout=30,
-            creationflags=creation_flags
+            **utils.NO_WINDOW
         )
         if result.returncode == 0:
             diagnostics.append(f"  remote access: OK")
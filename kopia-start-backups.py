@@ -32,6 +32,7 @@ import argparse
 import subprocess
 import signal
 import atexit
+import time
 import kopia_utils as utils
 from typing import Dict, Any, List, Tuple, Optional
 import json
@@ -42,6 +43,17 @@ import re
 # Track child processes for cleanup on Ctrl-C
 _child_processes: List[subprocess.Popen] = []
 
+# Shared so the rclone lookup and `rclone listremotes` run once per process
+_sync_runner: Optional[utils.KopiaSyncRunner] = None
+
+
+def get_sync_runner() -> utils.KopiaSyncRunner:
+    """Return the process-wide KopiaSyncRunner, creating it on first use."""
+    global _sync_runner
+    if _sync_runner is None:
+        _sync_runner = utils.KopiaSyncRunner()
+    return _sync_runner
+
 
 def kill_orphaned_rclone_processes():
     """Kill orphaned rclone 'serve webdav' processes spawned by kopia.
@@ -51,7 +63,7 @@ def kill_orphaned_rclone_processes():
     unrelated rclone servers the user may be running.
     """
     try:
-        if sys.platform == 'win32':
+        if utils.IS_WINDOWS:
             # Find rclone processes spawned by kopia (have kopia-rclone in temp path)
             result = subprocess.run(
                 ["powershell", "-Command",
@@ -59,8 +71,8 @@ def kill_orphaned_rclone_processes():
                  "Where-Object { $_.CommandLine -like '*serve*webdav*' -and "
                  "$_.CommandLine -like '*kopia-rclone*' } | "
                  "Select-Object ProcessId"],
-                capture_output=True, text=True, timeout=10,
-                creationflags=subprocess.CREATE_NO_WINDOW
+                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, timeout=10,
+                **utils.NO_WINDOW
             )
             if result.returncode == 0:
                 for line in result.stdout.strip().split('\n'):
@@ -69,8 +81,8 @@ def kill_orphaned_rclone_processes():
                         pid = int(line)
                         logging.info(f"Killing orphaned kopia-rclone process {pid}")
                         subprocess.run(["taskkill", "/F", "/PID", str(pid)],
-                                       capture_output=True,
-                                       creationflags=subprocess.CREATE_NO_WINDOW)
+                                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                       **utils.NO_WINDOW)
     except Exception as e:
         logging.debug(f"Error cleaning up rclone processes: {e}")
 
@@ -168,7 +180,7 @@ def preflight_checks(config: Dict[str, Any], runner: utils.KopiaRunner) -> Tuple
 
     # 4. If rclone is needed, validate remotes are configured
     if needs_rclone and tools_ok:
-        sync_runner = utils.KopiaSyncRunner()
+        sync_runner = get_sync_runner()
         for repo in config.get('repositories', []):
             repo_name = repo.get('name', 'unknown')
             for dest in repo.get('sync-to', []):
@@ -277,18 +289,47 @@ def get_snapshot_summary(
         return None
 
 
+# Kopia stderr fragments used to pick the next step when connecting
+_BAD_PASSWORD_MARKERS = ("invalid repository password", "incorrect password", "unable to unlock")
+_NOT_INITIALIZED_MARKERS = ("repository not initialized", "repository does not exist")
+
+
+def _classify_kopia_error(stderr: str) -> str:
+    """Classify a failed kopia repository command by its stderr.
+
+    Returns:
+        'no_password' - our own password lookup failed (kopia never ran)
+        'bad_password' - kopia rejected the password
+        'not_init' - no repository exists at the storage location
+        'other' - anything else
+    """
+    if "No password found" in stderr:
+        return 'no_password'
+    lowered = stderr.lower()
+    if any(marker in lowered for marker in _BAD_PASSWORD_MARKERS):
+        return 'bad_password'
+    if any(marker in lowered for marker in _NOT_INITIALIZED_MARKERS):
+        return 'not_init'
+    return 'other'
+
+
 def ensure_repository_connected(runner: utils.KopiaRunner, repo_config: Dict[str, Any], dry_run: bool = False) -> bool:
-    """Connects to the repository if not already connected."""
+    """Connects to the repository if not already connected.
+
+    Tries status -> connect -> create, using the stderr of each failed step to
+    skip steps that cannot succeed (e.g. no create after a password error).
+    """
     repo_path = repo_config['repo_destination']
     config_file = repo_config['repo_config']
 
-    # Ensure config dir exists
-    config_dir = os.path.dirname(config_file)
-    if not os.path.exists(config_dir) and not dry_run:
-        os.makedirs(config_dir, exist_ok=True)
+    # Already connected through this runner (e.g. an earlier backup of the same repo)
+    if not dry_run and config_file in runner.connected_configs:
+        print(f"[kopia] Connected to repository at {repo_path}")
+        return True
 
-    # Ensure repo dir exists
-    if not os.path.exists(repo_path) and not dry_run:
+    # Ensure config and repo dirs exist (exist_ok makes a separate exists check redundant)
+    if not dry_run:
+        os.makedirs(os.path.dirname(config_file), exist_ok=True)
         os.makedirs(repo_path, exist_ok=True)
 
     # Check status first to see if connected
@@ -299,23 +340,34 @@ def ensure_repository_connected(runner: utils.KopiaRunner, repo_config: Dict[str
 
     if success:
         print(f"[kopia] Connected to repository at {repo_path}")
+        if not dry_run:
+            runner.connected_configs.add(config_file)
         return True
 
-    # Check for password error (returned by runner when repo_config password lookup fails)
-    if "No password found" in stderr:
-        print(f"[kopia] ERROR: {stderr}")
+    # Password errors won't be fixed by connect/create
+    error_kind = _classify_kopia_error(stderr)
+    if error_kind in ('no_password', 'bad_password'):
+        print(f"[kopia] ERROR: {stderr.strip()}")
         return False
 
-    # If not connected, try to connect
-    success, _, stderr, _ = runner.run(
-        ["repository", "connect", "filesystem",
-         "--path", repo_path, "--config-file", config_file],
-        repo_config=repo_config, dry_run=dry_run
-    )
+    # If not connected, try to connect (skip when the repository doesn't exist yet)
+    if error_kind != 'not_init':
+        success, _, stderr, _ = runner.run(
+            ["repository", "connect", "filesystem",
+             "--path", repo_path, "--config-file", config_file],
+            repo_config=repo_config, dry_run=dry_run
+        )
 
-    if success:
-        print(f"[kopia] Connected to repository at {repo_path}")
-        return True
+        if success:
+            print(f"[kopia] Connected to repository at {repo_path}")
+            if not dry_run:
+                runner.connected_configs.add(config_file)
+            return True
+
+        # A wrong password means the repository exists - creating it would fail too
+        if _classify_kopia_error(stderr) == 'bad_password':
+            print(f"[kopia] ERROR: Failed to connect to repository: {stderr.strip()}")
+            return False
 
     # If connect failed, maybe it doesn't exist? Try create
     success, _, stderr, _ = runner.run(
@@ -325,11 +377,41 @@ def ensure_repository_connected(runner: utils.KopiaRunner, repo_config: Dict[str
     )
     if success:
         print(f"[kopia] Created new repository at {repo_path}")
+        if not dry_run:
+            runner.connected_configs.add(config_file)
     else:
         print(f"[kopia] ERROR: Failed to create repository: {stderr}")
 
     return success
 
+
+def _build_policy_flags(policies: Dict[str, Any]) -> Tuple[str, ...]:
+    """Build the `kopia policy set` flags shared by all sources of a repo.
+
+    Args:
+        policies: The repo's 'policies' config section
+
+    Returns:
+        Retention flags, then --add-ignore and --add-dot-ignore flags.
+    """
+    flags: List[str] = []
+
+    # Retention flags
+    for key in ('keep-annual', 'keep-monthly', 'keep-daily', 'keep-hourly', 'keep-latest', 'snapshot-interval'):
+        if key in policies:
+            flags.extend([f"--{key}", str(policies[key])])
+
+    for pattern in policies.get('ignore') or []:
+        flags.extend(["--add-ignore", pattern])
+
+    # Dot-ignore files (e.g., .gitignore, .kopiaignore) tell kopia to read
+    # ignore patterns from files in source directories
+    for filename in policies.get('dot-ignore') or []:
+        flags.extend(["--add-dot-ignore", filename])
+
+    return tuple(flags)
+
+
 def run_backup_job(
     runner: utils.KopiaRunner,
     repo_config: Dict[str, Any],
@@ -349,19 +431,21 @@ def run_backup_job(
     Returns:
         True if backup (and cloud sync if configured) succeeded.
     """
+    # Look up per-repo fields once; the source loop below reuses them
     repo_name = repo_config['name']
     sources = repo_config.get('sources', [])
-    has_cloud = utils.has_remote_destination(repo_config)
+    sync_to = repo_config.get('sync-to') or []
+    policies = repo_config.get('policies') or {}
+    config_file = repo_config['repo_config']
+    has_cloud = bool(sync_to)
 
-    # Visual header for repo
-    print(f"\n{'='*60}")
-    print(f"  {repo_name}")
-    print(f"{'='*60}")
-    print(f"Sources: {', '.join(sources)}")
+    # Visual header for repo, assembled and written in one call so it stays
+    # contiguous when interleaved with kopia/rclone output on the same console
+    header = [f"\n{'='*60}", f"  {repo_name}", '='*60, f"Sources: {', '.join(sources)}"]
     if has_cloud:
-        sync_dests = [utils.KopiaSyncRunner.get_destination_id(d) for d in repo_config.get('sync-to', [])]
-        print(f"Sync destinations: {', '.join(sync_dests)}")
-    print()
+        sync_dests = [utils.KopiaSyncRunner.get_destination_id(d) for d in sync_to]
+        header.append(f"Sync destinations: {', '.join(sync_dests)}")
+    print("\n".join(header) + "\n", flush=True)
 
     # 0. Sync from remote sources (e.g., WSL -> Windows) before backup
     if repo_config.get('sync-from'):
@@ -373,14 +457,14 @@ def run_backup_job(
         print(f"[ERROR] Skipping {repo_name} due to connection failure.")
         return False
 
-    config_file = repo_config['repo_config']
-    policies = repo_config.get('policies', {})
+    # Policy flags are identical for every source, so build them once per repo
+    policy_flags = _build_policy_flags(policies)
 
     # Track errors per source
     snapshot_errors: List[str] = []
     policy_warnings: List[str] = []
 
-    for source in repo_config['sources']:
+    for source in sources:
         # Check if source path exists before trying to back it up
         if not os.path.exists(source):
             error_msg = f"Source path does not exist: {source}"
@@ -390,24 +474,8 @@ def run_backup_job(
 
         # 1. Set Policy (Idempotent-ish, but good to ensure)
         print(f"[kopia] Setting policies for {source}...")
-        policy_cmd = ["policy", "set", source, "--config-file", config_file]
-
-        # Add retention flags
-        if 'keep-annual' in policies: policy_cmd.extend(["--keep-annual", str(policies['keep-annual'])])
-        if 'keep-monthly' in policies: policy_cmd.extend(["--keep-monthly", str(policies['keep-monthly'])])
-        if 'keep-daily' in policies: policy_cmd.extend(["--keep-daily", str(policies['keep-daily'])])
-        if 'keep-hourly' in policies: policy_cmd.extend(["--keep-hourly", str(policies['keep-hourly'])])
-        if 'keep-latest' in policies: policy_cmd.extend(["--keep-latest", str(policies['keep-latest'])])
-        if 'snapshot-interval' in policies: policy_cmd.extend(["--snapshot-interval", str(policies['snapshot-interval'])])
 
-        # Run main policy command (retention, etc.)
-        success, _, stderr, _ = runner.run(policy_cmd, repo_config=repo_config, dry_run=dry_run)
-        if not success:
-            warning = f"Policy set failed for {source}: {stderr}"
-            print(f"[kopia] Warning: {warning}")
-            policy_warnings.append(warning)
-
-        # Handle ignore patterns - must be separate commands because Kopia
+        # Ignore patterns need the clear in its own command because Kopia
         # processes --clear-ignore AFTER --add-ignore when on same command line
         clear_ignore_cmd = ["policy", "set", source, "--config-file", config_file, "--clear-ignore"]
         success, _, stderr, _ = runner.run(clear_ignore_cmd, repo_config=repo_config, dry_run=dry_run)
@@ -416,33 +484,21 @@ def run_backup_job(
             print(f"[kopia] Warning: {warning}")
             policy_warnings.append(warning)
 
-        if 'ignore' in policies and policies['ignore']:
-            add_ignore_cmd = ["policy", "set", source, "--config-file", config_file]
-            for pattern in policies['ignore']:
-                add_ignore_cmd.extend(["--add-ignore", pattern])
-            success, _, stderr, _ = runner.run(add_ignore_cmd, repo_config=repo_config, dry_run=dry_run)
-            if not success:
-                warning = f"Add ignore patterns failed for {source}: {stderr}"
-                print(f"[kopia] Warning: {warning}")
-                policy_warnings.append(warning)
-
-        # Handle dot-ignore files (e.g., .gitignore, .kopiaignore)
-        # These tell kopia to read ignore patterns from files in source directories
-        if 'dot-ignore' in policies and policies['dot-ignore']:
-            dot_ignore_cmd = ["policy", "set", source, "--config-file", config_file]
-            for filename in policies['dot-ignore']:
-                dot_ignore_cmd.extend(["--add-dot-ignore", filename])
-            success, _, stderr, _ = runner.run(dot_ignore_cmd, repo_config=repo_config, dry_run=dry_run)
-            if not success:
-                warning = f"Add dot-ignore failed for {source}: {stderr}"
-                print(f"[kopia] Warning: {warning}")
-                policy_warnings.append(warning)
+        # Retention, ignore patterns and dot-ignore files in one command
+        policy_cmd = ["policy", "set", source, "--config-file", config_file, *policy_flags]
+        success, _, stderr, _ = runner.run(policy_cmd, repo_config=repo_config, dry_run=dry_run)
+        if not success:
+            warning = f"Policy set failed for {source}: {stderr}"
+            print(f"[kopia] Warning: {warning}")
+            policy_warnings.append(warning)
 
         # 2. Create Snapshot
         print(f"[kopia] Creating snapshot for {source}...")
         snapshot_cmd = ["snapshot", "create", source, "--config-file", config_file]
 
-        success, _, stderr, _ = runner.run(snapshot_cmd, repo_config=repo_config, dry_run=dry_run)
+        # Let kopia's progress output stream to the console rather than buffering it
+        success, _, stderr, _ = runner.run(snapshot_cmd, repo_config=repo_config, dry_run=dry_run,
+                                           capture_stdout=False)
         if not success:
             error_msg = f"Snapshot failed for {source}: {stderr}"
             logging.error(f"[kopia] {error_msg}")
@@ -563,7 +619,7 @@ def sync_from_sources(repo_config: Dict[str, Any], dry_run: bool = False) -> boo
                 cmd,
                 capture_output=False,  # Show progress output
                 text=True,
-                creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
+                **utils.NO_WINDOW
             )
 
             if result.returncode == 0:
@@ -625,7 +681,7 @@ def sync_to_cloud(repo_config: Dict[str, Any], runner: utils.KopiaRunner, schedu
         print(f"[sync] ERROR: No password for repository '{repo_name}'")
         return False
 
-    sync_runner = utils.KopiaSyncRunner()
+    sync_runner = get_sync_runner()
     all_success = True
 
     for dest_config in sync_destinations:
@@ -637,21 +693,28 @@ def sync_to_cloud(repo_config: Dict[str, Any], runner: utils.KopiaRunner, schedu
         elapsed_minutes = None
         dest_status = utils.get_sync_status_for_destination(repo_name, dest_id)
         if dest_status and dest_status.get('success', False):
-            last_sync_str = dest_status.get('last_sync')
-            if last_sync_str:
-                try:
-                    last_sync = datetime.fromisoformat(last_sync_str.replace('Z', '+00:00'))
-                    now = datetime.now(timezone.utc)
-                    elapsed = (now - last_sync).total_seconds()
-                    elapsed_minutes = int(elapsed / 60)
-
-                    # Check if we should skip based on interval (unless force_sync)
-                    if not force_sync and elapsed < interval_seconds:
-                        remaining = int((interval_seconds - elapsed) / 60)
-                        print(f"[sync] Skipping {dest_id} (last sync {elapsed_minutes}m ago, next in ~{remaining}m)")
-                        continue  # Skip this destination, check next
-                except (ValueError, TypeError):
-                    pass  # Can't parse, proceed with sync
+            elapsed = None
+            last_sync_epoch = dest_status.get('last_sync_epoch')
+            if isinstance(last_sync_epoch, (int, float)):
+                elapsed = time.time() - last_sync_epoch
+            else:
+                # Entries written before last_sync_epoch existed only have the ISO string
+                last_sync_str = dest_status.get('last_sync')
+                if last_sync_str:
+                    try:
+                        last_sync = datetime.fromisoformat(last_sync_str.replace('Z', '+00:00'))
+                        elapsed = (datetime.now(timezone.utc) - last_sync).total_seconds()
+                    except (ValueError, TypeError):
+                        pass  # Can't parse, proceed with sync
+
+            if elapsed is not None:
+                elapsed_minutes = int(elapsed / 60)
+
+                # Check if we should skip based on interval (unless force_sync)
+                if not force_sync and elapsed < interval_seconds:
+                    remaining = int((interval_seconds - elapsed) / 60)
+                    print(f"[sync] Skipping {dest_id} (last sync {elapsed_minutes}m ago, next in ~{remaining}m)")
+                    continue  # Skip this destination, check next
 
         # Build sync message with optional last sync info
         sync_msg = f"\n[sync] Syncing to {dest_id}..."
@@ -759,29 +822,45 @@ def main():
     runner = utils.KopiaRunner()
     config = runner.config
 
-    # Cleanup stale status entries (repos no longer in config)
-    all_repo_names = [r['name'] for r in config['repositories']]
-    utils.cleanup_status_file(all_repo_names)
+    # Remember every configured repo for the status cleanup below, before --repo filtering
+    all_repo_names = {r['name'] for r in config['repositories']}
 
     # Filter repos if --repo is specified
     if args.repo:
-        repo_filter = [r.strip() for r in args.repo.split(',')]
-        config['repositories'] = [r for r in config['repositories'] if r['name'] in repo_filter]
+        repo_filter = {r.strip() for r in args.repo.split(',')}
+        config['repositories'] = tuple(r for r in config['repositories'] if r['name'] in repo_filter)
         if not config['repositories']:
             logging.error(f"No matching repositories found for: {args.repo}")
             sys.exit(1)
 
     # Perform pre-flight checks (unless skipped, registering, or scheduled mode)
+    preflight_ok, preflight_errors = True, []
+    preflight_key = None  # Set when a fresh verdict should be saved
     if not args.skip_preflight and not args.register and not args.scheduled:
-        preflight_ok, preflight_errors = preflight_checks(config, runner)
-        if not preflight_ok:
-            print("\n" + "="*60, file=sys.stderr)
-            print("PRE-FLIGHT CHECKS FAILED", file=sys.stderr)
-            print("="*60, file=sys.stderr)
-            for error in preflight_errors:
-                print(error, file=sys.stderr)
-            print("\nUse --skip-preflight to bypass these checks (not recommended).", file=sys.stderr)
-            sys.exit(1)
+        # Reuse a recent passing verdict if nothing preflight depends on has changed
+        key = utils.get_preflight_cache_key(config)
+        if utils.is_preflight_cached(key):
+            logging.debug("Pre-flight checks passed recently with unchanged inputs, skipping.")
+        else:
+            preflight_ok, preflight_errors = preflight_checks(config, runner)
+            if not args.dry_run:
+                preflight_key = key
+
+    # Cleanup stale status entries (repos no longer in config) and record the
+    # preflight verdict with a single status file write
+    with utils.status_transaction() as status:
+        utils.cleanup_status_file(all_repo_names, status=status)
+        if preflight_key is not None:
+            utils.save_preflight_result(preflight_key, preflight_ok, status=status)
+
+    if not preflight_ok:
+        print("\n" + "="*60, file=sys.stderr)
+        print("PRE-FLIGHT CHECKS FAILED", file=sys.stderr)
+        print("="*60, file=sys.stderr)
+        for error in preflight_errors:
+            print(error, file=sys.stderr)
+        print("\nUse --skip-preflight to bypass these checks (not recommended).", file=sys.stderr)
+        sys.exit(1)
 
     if args.register:
         success = register_backup_task(config)
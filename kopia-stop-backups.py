@@ -16,7 +16,12 @@ Requires:
 import sys
 import argparse
 import subprocess
-import kopia_utils as utils
+
+IS_WINDOWS = sys.platform == "win32"
+
+# Task Scheduler helpers are only needed on Windows; elsewhere main() exits early
+if IS_WINDOWS:
+    import kopia_utils as utils
 
 # Exit codes
 EXIT_SUCCESS = 0
@@ -38,11 +43,12 @@ def unregister_task(task_name: str) -> bool:
         True if task was removed or didn't exist, False on error.
     """
     try:
-        # Check if task exists first
+        # Check if task exists first (only the return code matters)
         check_result = subprocess.run(
             ["schtasks", "/Query", "/TN", task_name],
-            capture_output=True,
-            text=True
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            **utils.NO_WINDOW
         )
 
         if check_result.returncode != 0:
@@ -53,7 +59,8 @@ def unregister_task(task_name: str) -> bool:
         result = subprocess.run(
             ["schtasks", "/Delete", "/TN", task_name, "/F"],
             capture_output=True,
-            text=True
+            text=True,
+            **utils.NO_WINDOW
         )
 
         if result.returncode == 0:
@@ -90,7 +97,7 @@ Examples:
     unregister_health = args.health or (not args.backups and not args.health)
 
     # Check Windows platform
-    if sys.platform != "win32":
+    if not IS_WINDOWS:
         print("This script is only supported on Windows.")
         print("On other platforms, use your system's cron or systemd to manage scheduled tasks.")
         sys.exit(EXIT_NOT_WINDOWS)
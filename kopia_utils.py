@@ -27,12 +27,18 @@ import os
 import sys
 import subprocess
 import logging
-import yaml
 import re
 import json
-from datetime import datetime, timezone
+import functools
+import contextlib
+import time
+import hashlib
+import shutil
+import tempfile
+from datetime import datetime
 from pathlib import Path
-from typing import Tuple, Optional, List, Dict, Any, Union
+from collections import deque
+from typing import Tuple, Optional, List, Dict, Any, Union, Iterable, Iterator, Deque
 
 # Determine script directory for relative paths
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -42,58 +48,62 @@ RCLONE_EXE = "rclone"
 CONFIG_FILE = os.path.join(SCRIPT_DIR, "kopia-helpers.yaml")
 STATUS_FILE = os.path.join(Path.home(), ".kopia-helpers-status.json")
 
-
-def check_tool_available(tool_name: str) -> Tuple[bool, str]:
+# Platform flags, computed once
+IS_WINDOWS = sys.platform == "win32"
+# Windows CREATE_NO_WINDOW: no console popup for child processes (0 = no-op elsewhere)
+CREATE_NO_WINDOW = 0x08000000 if IS_WINDOWS else 0
+# STARTUPINFO asking Windows to hide any window the child creates (SW_HIDE);
+# None elsewhere, which subprocess treats as "not given"
+if IS_WINDOWS:
+    HIDDEN_STARTUPINFO = subprocess.STARTUPINFO()
+    HIDDEN_STARTUPINFO.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+    HIDDEN_STARTUPINFO.wShowWindow = 0  # SW_HIDE
+else:
+    HIDDEN_STARTUPINFO = None
+# subprocess kwargs for background children: subprocess.run(cmd, **NO_WINDOW)
+NO_WINDOW: Dict[str, Any] = {"creationflags": CREATE_NO_WINDOW, "startupinfo": HIDDEN_STARTUPINFO}
+
+
+@functools.lru_cache(maxsize=None)
+def check_tool_available(tool_name: str, need_version: bool = False) -> Tuple[bool, str]:
     """Check if an external tool is available in PATH.
 
+    Memoized for the life of the process - tool installs don't change mid-run.
+
     Args:
         tool_name: Name of the executable to check (e.g., 'kopia', 'rclone')
+        need_version: If True, also run '<tool> --version' (spawns a process)
 
     Returns:
-        Tuple of (is_available, version_or_error_message)
+        Tuple of (is_available, version_or_path_or_error_message)
     """
-    try:
-        # Use 'where' on Windows, 'which' on Unix
-        if sys.platform == "win32":
-            result = subprocess.run(
-                ["where", tool_name],
-                capture_output=True,
-                text=True,
-                creationflags=0x08000000  # CREATE_NO_WINDOW
-            )
-        else:
-            result = subprocess.run(
-                ["which", tool_name],
-                capture_output=True,
-                text=True
-            )
+    # PATH lookup in-process (honours PATHEXT on Windows) instead of spawning where/which
+    tool_path = shutil.which(tool_name)
+    if tool_path is None:
+        return False, f"'{tool_name}' not found in PATH"
 
-        if result.returncode != 0:
-            return False, f"'{tool_name}' not found in PATH"
+    if not need_version:
+        return True, tool_path
 
-        # Try to get version
-        try:
-            version_result = subprocess.run(
-                [tool_name, "--version"],
-                capture_output=True,
-                text=True,
-                timeout=10,
-                creationflags=0x08000000 if sys.platform == "win32" else 0
-            )
-            version = version_result.stdout.strip().split('\n')[0] if version_result.stdout else "unknown version"
-            return True, version
-        except Exception:
-            return True, "version unknown"
-
-    except FileNotFoundError:
-        return False, f"'{tool_name}' not found in PATH"
-    except Exception as e:
-        return False, str(e)
+    # Try to get version
+    try:
+        version_result = subprocess.run(
+            [tool_path, "--version"],
+            stdout=subprocess.PIPE,  # only the version line is used
+            stderr=subprocess.DEVNULL,
+            text=True,
+            timeout=10,
+            **NO_WINDOW
+        )
+        version = version_result.stdout.strip().split('\n')[0] if version_result.stdout else "unknown version"
+        return True, version
+    except Exception:
+        return True, "version unknown"
 
 
 def get_kopia_install_instructions() -> str:
     """Get installation instructions for Kopia."""
-    if sys.platform == "win32":
+    if IS_WINDOWS:
         return """
 Kopia is not installed or not in PATH.
 
@@ -143,7 +153,7 @@ After installation, verify with: kopia --version
 
 def get_rclone_install_instructions() -> str:
     """Get installation instructions for rclone."""
-    if sys.platform == "win32":
+    if IS_WINDOWS:
         return """
 rclone is not installed or not in PATH.
 
@@ -207,10 +217,19 @@ def validate_required_tools(require_rclone: bool = False) -> Tuple[bool, List[st
     Returns:
         Tuple of (all_tools_available, list_of_error_messages)
     """
+    # Versions are only logged at debug level, so only spawn --version then
+    need_version = logging.getLogger().isEnabledFor(logging.DEBUG)
+    tools_ok, errors = _validate_required_tools(require_rclone, need_version)
+    return tools_ok, list(errors)
+
+
+@functools.lru_cache(maxsize=None)
+def _validate_required_tools(require_rclone: bool, need_version: bool) -> Tuple[bool, Tuple[str, ...]]:
+    """Memoized body of validate_required_tools (returns errors as a tuple)."""
     errors = []
 
     # Check kopia
-    kopia_ok, kopia_result = check_tool_available(KOPIA_EXE)
+    kopia_ok, kopia_result = check_tool_available(KOPIA_EXE, need_version=need_version)
     if not kopia_ok:
         errors.append(f"ERROR: {kopia_result}")
         errors.append(get_kopia_install_instructions())
@@ -219,14 +238,14 @@ def validate_required_tools(require_rclone: bool = False) -> Tuple[bool, List[st
 
     # Check rclone if required
     if require_rclone:
-        rclone_ok, rclone_result = check_tool_available(RCLONE_EXE)
+        rclone_ok, rclone_result = check_tool_available(RCLONE_EXE, need_version=need_version)
         if not rclone_ok:
             errors.append(f"ERROR: {rclone_result}")
             errors.append(get_rclone_install_instructions())
         else:
             logging.debug(f"Found rclone: {rclone_result}")
 
-    return len(errors) == 0, errors
+    return len(errors) == 0, tuple(errors)
 
 
 def is_cloud_path(path: str) -> bool:
@@ -241,11 +260,10 @@ def is_cloud_path(path: str) -> bool:
     Returns:
         True if path appears to be a cloud/rclone remote path.
     """
-    if not path or ':' not in path:
-        return False
     # Windows paths like C:\foo have colon at position 1
     # Cloud paths like onedrive:foo have colon after the remote name
-    colon_pos = path.index(':')
+    # Single find: -1 (no colon) and 0/1 (drive letter) are all "not cloud"
+    colon_pos = path.find(':') if path else -1
     # Windows drive letters are single characters (C:, D:, etc.)
     # Cloud remotes are typically longer (onedrive:, gdrive:, s3:, etc.)
     return colon_pos > 1
@@ -314,17 +332,49 @@ def validate_source_paths(sources: List[str], repo_name: str) -> Tuple[bool, Lis
     return len(warnings) == 0, warnings
 
 
-def load_config(config_path: Optional[str] = None, validate_sources: bool = True) -> Dict[str, Any]:
-    """Load and parse the YAML config file.
+# Parsed+normalized configs keyed by (abspath, mtime_ns, size)
+_CONFIG_CACHE: Dict[Tuple[str, int, int], Dict[str, Any]] = {}
 
-    Normalizes all paths for the current OS (Windows/Linux).
-    Validates field names and required fields, exits with error on unknown fields.
+
+def _load_yaml(path: str) -> Any:
+    """Parse a YAML file with the fastest available safe loader.
+
+    Uses LibYAML's CSafeLoader when PyYAML was built with it, else SafeLoader
+    (same safe semantics either way).
+
+    Raises:
+        OSError (e.g. FileNotFoundError) if the file can't be read,
+        yaml.YAMLError if it isn't valid YAML.
     """
-    if config_path is None:
-        config_path = CONFIG_FILE
+    import yaml
     try:
-        with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
+        from yaml import CSafeLoader as loader
+    except ImportError:
+        from yaml import SafeLoader as loader
+
+    # Bytes let LibYAML do its own (UTF-8/BOM-aware) decoding
+    with open(path, 'rb') as f:
+        return yaml.load(f, Loader=loader)
+
+
+def _password_env_key(repo_name: str) -> str:
+    """Name of the repo-specific password environment variable.
+
+    Example: 'mysrc-backup' -> 'KOPIA_PASSWORD_MYSRC_BACKUP'
+    """
+    return 'KOPIA_PASSWORD_' + repo_name.upper().replace('-', '_')
+
+
+def _parse_config(config_path: str) -> Dict[str, Any]:
+    """Parse the YAML config file, validate field names and normalize paths.
+
+    Exits with an error on a missing file, invalid YAML or bad fields.
+    """
+    # Imported here so scripts/paths that never parse YAML (and cached loads) skip the import
+    import yaml
+
+    try:
+        config = _load_yaml(config_path)
     except FileNotFoundError:
         print(f"Error: Config file not found: {config_path}", file=sys.stderr)
         print(f"  Copy kopia-helpers.template.yaml to kopia-helpers.yaml and edit it.", file=sys.stderr)
@@ -335,6 +385,7 @@ def load_config(config_path: Optional[str] = None, validate_sources: bool = True
         sys.exit(1)
 
     # Validate and normalize each repository
+    normpath = os.path.normpath  # local alias for the per-path calls below
     for repo in config.get('repositories', []):
         repo_name = repo.get('name', '<unnamed>')
 
@@ -352,28 +403,111 @@ def load_config(config_path: Optional[str] = None, validate_sources: bool = True
             sys.exit(1)
 
         # Normalize paths for current OS
-        if 'repo_destination' in repo:
-            repo['repo_destination'] = os.path.normpath(repo['repo_destination'])
-        if 'repo_config' in repo:
-            repo['repo_config'] = os.path.normpath(repo['repo_config'])
-        if 'sources' in repo:
-            repo['sources'] = [os.path.normpath(s) for s in repo['sources']]
-
-        # Validate source paths exist (optional, but warn if not)
-        if validate_sources and 'sources' in repo:
-            _, source_warnings = validate_source_paths(repo['sources'], repo_name)
-            for warning in source_warnings:
-                print(warning, file=sys.stderr)
+        # (required fields, so all present after the check above)
+        repo['repo_destination'] = normpath(repo['repo_destination'])
+        repo['repo_config'] = normpath(repo['repo_config'])
+        repo['sources'] = [normpath(s) for s in repo['sources']]
+
+        # Password env var name, built once here rather than on every get_password
+        repo['_env_key'] = _password_env_key(str(repo.get('name', '')))
+
+    return config
+
+
+def _copy_containers(value: Any) -> Any:
+    """Copy the dict/list containers of a parsed config (or other JSON-like tree).
+
+    Much cheaper than copy.deepcopy: YAML/JSON leaves (str, int, bool, None...)
+    are immutable and shared, and there is no memo dict or cycle tracking.
+    """
+    if isinstance(value, dict):
+        return {k: _copy_containers(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy_containers(v) for v in value]
+    return value
+
+
+def load_config(config_path: Optional[str] = None, validate_sources: bool = True) -> Dict[str, Any]:
+    """Load and parse the YAML config file.
+
+    Normalizes all paths for the current OS (Windows/Linux).
+    Validates field names and required fields, exits with error on unknown fields.
+    The parsed result is cached per file version; callers get their own copy.
+    """
+    if config_path is None:
+        config_path = CONFIG_FILE
+
+    try:
+        st = os.stat(config_path)
+        cache_key = (os.path.abspath(config_path), st.st_mtime_ns, st.st_size)
+    except OSError:
+        cache_key = None  # Let _parse_config report the missing file
+
+    config = _CONFIG_CACHE.get(cache_key) if cache_key else None
+    if config is None:
+        config = _parse_config(config_path)
+        if cache_key:
+            _CONFIG_CACHE[cache_key] = config
+
+    # Callers mutate the result (e.g. --repo filtering), so never hand out the cached dict
+    config = _copy_containers(config)
+
+    # Validate source paths exist (optional, but warn if not) - checked every load
+    if validate_sources:
+        for repo in config.get('repositories', []):
+            if 'sources' in repo:
+                _, source_warnings = validate_source_paths(repo['sources'], repo.get('name', '<unnamed>'))
+                for warning in source_warnings:
+                    print(warning, file=sys.stderr)
 
     return config
 
 
+@functools.lru_cache(maxsize=None)
+def _get_dotenv_values():
+    """Return python-dotenv's dotenv_values, or None if it isn't installed.
+
+    Resolved once: a failed import isn't cached by Python, so retrying it for
+    every env file would repeat the whole sys.path search.
+    """
+    try:
+        from dotenv import dotenv_values
+        return dotenv_values
+    except ImportError:
+        return None
+
+
+# KOPIA_PASSWORD* assignment lines in an env file (fallback parser when python-dotenv is missing)
+_ENV_PASSWORD_LINE_RE = re.compile(r'^[ \t]*(KOPIA_PASSWORD[^=\r\n]*)=([^\r\n]*)', re.MULTILINE)
+
+
+class _LazyCmdline:
+    """Render a command for logging only when the record is actually emitted.
+
+    Pass as a %-style logging argument; --password=... values are masked.
+    """
+    __slots__ = ('cmd',)
+
+    def __init__(self, cmd: List[str]):
+        self.cmd = cmd
+
+    def __str__(self) -> str:
+        return subprocess.list2cmdline(
+            ['--password=***' if c.startswith('--password=') else c for c in self.cmd])
+
+
 class KopiaRunner:
     """Handles Kopia command execution and configuration."""
 
     def __init__(self, config_path: Optional[str] = None, skip_config: bool = False):
         self.config = {} if skip_config else load_config(config_path)
         self._kopia_not_found_warned = False
+        # Parsed .env files: filepath -> ((mtime_ns, size), KOPIA_PASSWORD* vars)
+        self._env_cache: Dict[str, Tuple[Tuple[int, int], Dict[str, str]]] = {}
+        # Child environments with KOPIA_PASSWORD set, keyed by password (see run())
+        self._password_envs: Dict[str, Dict[str, str]] = {}
+        # Kopia config files already known to be connected in this process
+        self.connected_configs: set = set()
 
     def run(
         self,
@@ -383,7 +517,8 @@ class KopiaRunner:
         dry_run: bool = False,
         wait: bool = True,
         readonly: bool = False,
-        log_level: Optional[str] = "error"
+        log_level: Optional[str] = "error",
+        capture_stdout: bool = True
     ) -> Tuple[bool, str, str, Optional[subprocess.Popen]]:
         """Run a kopia command with the given arguments.
 
@@ -397,6 +532,9 @@ class KopiaRunner:
             readonly: If True, disable content logging (for ls, snapshot list, diff, etc.)
             log_level: Kopia log level (default: "error" to reduce noise). Set to None to
                        use kopia's default. Options: debug, info, warning, error
+            capture_stdout: If False, stdout goes straight to our console instead of being
+                            buffered in memory (returned stdout is then empty). Stderr is
+                            still captured for error reporting.
 
         Returns:
             (success, stdout, stderr, process) - process is None for sync calls
@@ -410,8 +548,12 @@ class KopiaRunner:
                 repo_name = repo_config.get('name', 'unknown')
                 error_msg = f"No password found for '{repo_name}'"
                 return False, "", error_msg, None
-            env = os.environ.copy()
-            env["KOPIA_PASSWORD"] = password
+            # One environ copy per distinct password, reused for every command
+            env = self._password_envs.get(password)
+            if env is None:
+                env = os.environ.copy()
+                env["KOPIA_PASSWORD"] = password
+                self._password_envs[password] = env
 
         # Build command with logging options
         # Global flags must come before the subcommand
@@ -421,39 +563,46 @@ class KopiaRunner:
         if readonly:
             cmd.append("--disable-content-log")
         cmd.extend(args)
-        cmd_str = subprocess.list2cmdline(cmd)
 
         if dry_run:
-            logging.info(f"[DRY-RUN] Would execute: {cmd_str}")
+            logging.info(f"[DRY-RUN] Would execute: {subprocess.list2cmdline(cmd)}")
             return True, "", "", None
 
-        logging.debug(f"Executing: {cmd_str}")
+        logging.debug("Executing: %s", _LazyCmdline(cmd))
 
         try:
-            # CREATE_NO_WINDOW prevents console popup on Windows
-            creation_flags = 0x08000000 if sys.platform == "win32" else 0
+            if capture_stdout:
+                stdout_target = subprocess.PIPE
+            else:
+                # Inherit our stdout; under pythonw there is no console, so discard
+                stdout_target = None if sys.stdout is not None else subprocess.DEVNULL
+                if sys.stdout is not None:
+                    # Flush our buffered prints so they land before the child's output
+                    # when stdout is a file or pipe
+                    sys.stdout.flush()
 
             if wait:
                 result = subprocess.run(
                     cmd,
                     env=env,
-                    capture_output=True,
+                    stdout=stdout_target,
+                    stderr=subprocess.PIPE,
                     text=True,
                     encoding='utf-8',
-                    creationflags=creation_flags
+                    **NO_WINDOW
                 )
-                return result.returncode == 0, result.stdout, result.stderr, None
+                return result.returncode == 0, result.stdout or "", result.stderr, None
             else:
                 # For mount operations and streaming - return process for caller to manage
                 # Redirect stderr to DEVNULL to prevent terminal contamination
                 process = subprocess.Popen(
                     cmd,
                     env=env,
-                    stdout=subprocess.PIPE,
+                    stdout=stdout_target,
                     stderr=subprocess.PIPE,
                     text=True,
                     encoding='utf-8',
-                    creationflags=creation_flags
+                    **NO_WINDOW
                 )
                 return True, "", "", process
 
@@ -481,48 +630,11 @@ class KopiaRunner:
         Returns the password string or None.
         """
         repo_name = repo_config.get('name', '')
-        normalized_name = self._normalize_repo_name(repo_name)
-        repo_specific_key = f'KOPIA_PASSWORD_{normalized_name}'
-        global_key = 'KOPIA_PASSWORD'
-
-        # 1. Check yaml config first (explicit config wins)
-        password = repo_config.get('repo_password')
-        if password:
-            return password
-
-        # 2. Check ENV for repo-specific key
-        password = os.environ.get(repo_specific_key)
-        if password:
-            return password
-
-        # Parse .env.local once
-        env_local = self._parse_env_file(os.path.join(SCRIPT_DIR, '.env.local'))
-
-        # 3. Check .env.local repo-specific key
-        password = env_local.get(repo_specific_key)
-        if password:
-            return password
+        # Precomputed by load_config; built here for repo dicts from elsewhere
+        repo_specific_key = repo_config.get('_env_key') or _password_env_key(repo_name)
 
-        # Parse .env once
-        env_file = self._parse_env_file(os.path.join(SCRIPT_DIR, '.env'))
-
-        # 3. Check .env repo-specific key
-        password = env_file.get(repo_specific_key)
-        if password:
-            return password
-
-        # 5. Check ENV for global key
-        password = os.environ.get(global_key)
-        if password:
-            return password
-
-        # 6. Check .env.local for global key
-        password = env_local.get(global_key)
-        if password:
-            return password
-
-        # 6. Check .env for global key
-        password = env_file.get(global_key)
+        # First non-empty candidate wins; env files are only parsed if reached
+        password = next(filter(None, self._password_candidates(repo_config, repo_specific_key)), None)
         if password:
             return password
 
@@ -532,43 +644,57 @@ class KopiaRunner:
         print(f"  See README.md for details.", file=sys.stderr)
         return None
 
-    def _normalize_repo_name(self, name: str) -> str:
-        """Convert repo name to environment variable format.
+    def _password_candidates(self, repo_config: Dict[str, Any], repo_specific_key: str) -> Iterator[Optional[str]]:
+        """Yield password candidates lazily, in the get_password lookup order."""
+        # 1. yaml config first (explicit config wins)
+        yield repo_config.get('repo_password')
 
-        Example: 'mysrc-backup' -> 'MYSRC_BACKUP'
-        """
-        return name.upper().replace('-', '_')
+        # 2-4: repo-specific key, then 5-7: global key - each from ENV, .env.local, .env
+        env_files = (os.path.join(SCRIPT_DIR, '.env.local'), os.path.join(SCRIPT_DIR, '.env'))
+        for key in (repo_specific_key, 'KOPIA_PASSWORD'):
+            yield os.environ.get(key)
+            for env_file in env_files:
+                yield self._parse_env_file(env_file).get(key)
 
     def _parse_env_file(self, filepath: str) -> Dict[str, str]:
         """Parse env file and return dict of all KOPIA_PASSWORD* keys.
 
         Uses python-dotenv if available, falls back to simple parsing.
+        Results are cached per file until its mtime or size changes.
         """
-        if not os.path.exists(filepath):
+        try:
+            st = os.stat(filepath)
+        except OSError:
             return {}
 
-        try:
-            from dotenv import dotenv_values
+        signature = (st.st_mtime_ns, st.st_size)
+        cached = self._env_cache.get(filepath)
+        if cached and cached[0] == signature:
+            return cached[1]
+
+        result = self._read_env_file(filepath)
+        self._env_cache[filepath] = (signature, result)
+        return result
+
+    @staticmethod
+    def _read_env_file(filepath: str) -> Dict[str, str]:
+        """Read KOPIA_PASSWORD* keys from an env file (uncached)."""
+        dotenv_values = _get_dotenv_values()
+        if dotenv_values is not None:
             all_vars = dotenv_values(filepath)
             return {k: v for k, v in all_vars.items() if k and v and k.startswith('KOPIA_PASSWORD')}
-        except ImportError:
-            pass  # Fall back to simple parsing
+        # python-dotenv not installed - fall back to simple parsing
 
-        # Simple fallback parser
+        # Simple fallback parser: one regex pass finds only the KOPIA_PASSWORD* lines
         result = {}
         try:
             with open(filepath, 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if not line or line.startswith('#') or '=' not in line:
-                        continue
-                    if not line.startswith('KOPIA_PASSWORD'):
-                        continue
-                    key, value = line.split('=', 1)
-                    key, value = key.strip(), value.strip()
-                    if len(value) >= 2 and value[0] == value[-1] and value[0] in '"\'':
-                        value = value[1:-1]
-                    result[key] = value
+                content = f.read()
+            for match in _ENV_PASSWORD_LINE_RE.finditer(content):
+                key, value = match.group(1).strip(), match.group(2).strip()
+                if len(value) >= 2 and value[0] == value[-1] and value[0] in '"\'':
+                    value = value[1:-1]
+                result[key] = value
         except Exception:
             pass
         return result
@@ -607,6 +733,10 @@ def format_timestamp_utc(time_str: str) -> str:
         return time_str
 
 
+# Date, time (no micros), and timezone offset from kopia's verbose timestamps
+_KOPIA_VERBOSE_TS_RE = re.compile(r"^(\d{4}-\d{2}-\d{2})\s+(\d{2}:\d{2}:\d{2})(?:\.\d+)?\s+([+-]\d{4})")
+
+
 def format_kopia_verbose_timestamp(timestamp_str: str) -> str:
     """Clean up verbose kopia timestamp from diff output.
 
@@ -617,9 +747,10 @@ def format_kopia_verbose_timestamp(timestamp_str: str) -> str:
         Cleaned string like "2025-11-22 16:09:30 +1100"
     """
     # Use regex to extract date, time (no micros), and timezone offset
-    match = re.match(r"^(\d{4}-\d{2}-\d{2})\s+(\d{2}:\d{2}:\d{2})(?:\.\d+)?\s+([+-]\d{4})", timestamp_str)
+    match = _KOPIA_VERBOSE_TS_RE.match(timestamp_str)
     if match:
-        return f"{match.group(1)} {match.group(2)} {match.group(3)}"
+        date, time_of_day, tz = match.groups()
+        return f"{date} {time_of_day} {tz}"
     
     # Fallback to simple split if regex fails
     try:
@@ -631,15 +762,20 @@ def format_kopia_verbose_timestamp(timestamp_str: str) -> str:
         return timestamp_str.split("+")[0].strip()
 
 
+@functools.lru_cache(maxsize=1)
 def get_pythonw_exe() -> str:
     """Get path to pythonw.exe for background execution (no console window).
 
     Finds pythonw.exe in the same directory as the current Python interpreter,
     regardless of how Python was invoked (python.exe, py.exe, python3.exe, etc.).
+    Cached: the interpreter location doesn't change while the process runs.
 
     Returns:
-        Path to pythonw.exe if it exists, otherwise sys.executable.
+        Path to pythonw.exe if it exists (Windows only), otherwise sys.executable.
     """
+    if not IS_WINDOWS:
+        return sys.executable
+
     python_dir = Path(sys.executable).parent
     pythonw_exe = python_dir / "pythonw.exe"
 
@@ -650,13 +786,16 @@ def get_pythonw_exe() -> str:
         return sys.executable
 
 
+@functools.lru_cache(maxsize=1)
 def is_admin() -> bool:
     """Check if the current process is running with Administrator privileges.
 
+    Cached: a process's elevation doesn't change while it runs.
+
     Returns:
         True if running as Administrator, False otherwise.
     """
-    if sys.platform != "win32":
+    if not IS_WINDOWS:
         # On non-Windows, check if running as root
         return os.geteuid() == 0 if hasattr(os, 'geteuid') else False
 
@@ -667,9 +806,12 @@ def is_admin() -> bool:
         return False
 
 
+@functools.lru_cache(maxsize=None)
 def is_task_registered(task_name: str) -> bool:
     """Check if a Windows Task Scheduler task is registered.
 
+    Cached per task name for the run; register_scheduled_task clears it.
+
     Args:
         task_name: Name of the scheduled task
 
@@ -679,8 +821,9 @@ def is_task_registered(task_name: str) -> bool:
     try:
         result = subprocess.run(
             ["schtasks", "/query", "/TN", task_name],
-            capture_output=True,
-            text=True
+            stdout=subprocess.DEVNULL,  # only the return code matters
+            stderr=subprocess.DEVNULL,
+            **NO_WINDOW
         )
         return result.returncode == 0
     except Exception:
@@ -708,10 +851,11 @@ def register_scheduled_task(
     """
     pythonw_exe = get_pythonw_exe()
 
-    # Build the action command
-    action = f'"{pythonw_exe}" "{script_path}" --scheduled'
+    # Build the action command (one join over all parts)
+    parts = [f'"{pythonw_exe}"', f'"{script_path}"', '--scheduled']
     if extra_args:
-        action += ' ' + ' '.join(extra_args)
+        parts.extend(extra_args)
+    action = ' '.join(parts)
 
     cmd = [
         "schtasks", "/create",
@@ -727,9 +871,10 @@ def register_scheduled_task(
 
     print(f"Registering task '{task_name}' to run every {interval_minutes} minutes...")
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        result = subprocess.run(cmd, capture_output=True, text=True, **NO_WINDOW)
         if result.returncode == 0:
             print(f"Successfully registered '{task_name}'")
+            is_task_registered.cache_clear()
             return True
         else:
             print(f"Failed to register task: {result.stderr}")
@@ -739,6 +884,26 @@ def register_scheduled_task(
         return False
 
 
+@functools.lru_cache(maxsize=128)
+def _webdav_pattern(remote_path: str, windows: bool) -> "re.Pattern[str]":
+    """Compile the `serve webdav <path>` matcher used by _path_in_cmdline.
+
+    Cached per path, so scanning many process lines (and checking several
+    destinations) escapes and compiles each path's pattern only once.
+    """
+    # Escape special regex characters in the path
+    escaped_path = re.escape(remote_path)
+
+    # Pattern matches: serve webdav <path> (with optional quotes around path)
+    # The path must be followed by whitespace or end of string (not more path segments)
+    # Format: rclone [-v] serve webdav <remote:path> [--addr ...]
+    if windows:
+        # Windows: only double quotes, case-insensitive
+        return re.compile(rf'serve\s+webdav\s+"?({escaped_path})"?(?:\s|$)', re.IGNORECASE)
+    # Linux/Unix: single or double quotes, case-sensitive
+    return re.compile(rf'serve\s+webdav\s+["\']?({escaped_path})["\']?(?:\s|$)')
+
+
 class KopiaSyncRunner:
     """Handles kopia repository sync-to operations for syncing to remote destinations."""
 
@@ -760,6 +925,10 @@ class KopiaSyncRunner:
 
     def __init__(self):
         self._warned_remotes = set()
+        # Names from `rclone listremotes`, filled on first use (see refresh_remotes)
+        self._remotes: Optional[set] = None
+        # Resolve rclone once; None means it isn't installed
+        self._rclone_path = shutil.which(RCLONE_EXE)
 
     @staticmethod
     def get_destination_id(dest_config: Dict[str, Any]) -> str:
@@ -788,28 +957,45 @@ class KopiaSyncRunner:
             return f"webdav:{dest_config.get('url', 'unknown')}"
         return f"{dest_type}:unknown"
 
+    def refresh_remotes(self) -> None:
+        """Forget the cached rclone remote list so the next check re-runs listremotes."""
+        self._remotes = None
+
     def check_rclone_remote_configured(self, remote_name: str) -> bool:
         """Check if an rclone remote is configured.
 
+        The remote list is fetched once per instance; call refresh_remotes()
+        if rclone config may have changed since.
+
         Args:
             remote_name: Name of the remote (e.g., 'onedrive')
 
         Returns:
             True if remote is configured, False otherwise.
         """
+        if self._remotes is not None:
+            return remote_name in self._remotes
+
+        if self._rclone_path is None:
+            # Known missing - don't attempt (and fail) an exec
+            if 'rclone' not in self._warned_remotes:
+                logging.error("rclone not found. Install from https://rclone.org/downloads/")
+                self._warned_remotes.add('rclone')
+            return False
+
         try:
-            creation_flags = 0x08000000 if sys.platform == "win32" else 0
             result = subprocess.run(
-                [RCLONE_EXE, "listremotes"],
-                capture_output=True,
+                [self._rclone_path, "listremotes"],
+                stdout=subprocess.PIPE,  # stderr is never inspected
+                stderr=subprocess.DEVNULL,
                 text=True,
                 encoding='utf-8',
-                creationflags=creation_flags
+                **NO_WINDOW
             )
             if result.returncode != 0:
                 return False
-            configured_remotes = [line.rstrip(':') for line in result.stdout.strip().split('\n') if line]
-            return remote_name in configured_remotes
+            self._remotes = {line[:-1] for line in result.stdout.splitlines() if line.endswith(':')}
+            return remote_name in self._remotes
         except FileNotFoundError:
             if 'rclone' not in self._warned_remotes:
                 logging.error("rclone not found. Install from https://rclone.org/downloads/")
@@ -820,10 +1006,12 @@ class KopiaSyncRunner:
             return False
 
     @staticmethod
+    @functools.lru_cache(maxsize=512)
     def _normalize_remote_path(path: str) -> str:
         """Normalize remote path for comparison.
 
         Strips trailing slashes, quotes, and handles case for consistent matching.
+        Cached: configs name a handful of remote paths, checked repeatedly.
         """
         # Strip quotes that might wrap the path
         path = path.strip('"\'')
@@ -832,7 +1020,7 @@ class KopiaSyncRunner:
         # On Windows, rclone remote names are case-insensitive
         # But the path after : may be case-sensitive depending on remote
         # For safety, we'll do case-insensitive compare on Windows
-        if sys.platform == "win32":
+        if IS_WINDOWS:
             path = path.lower()
         return path
 
@@ -849,24 +1037,7 @@ class KopiaSyncRunner:
         Returns:
             True if path found in rclone serve webdav command
         """
-        import re
-
-        # Escape special regex characters in the path
-        escaped_path = re.escape(remote_path)
-
-        # Pattern matches: serve webdav <path> (with optional quotes around path)
-        # The path must be followed by whitespace or end of string (not more path segments)
-        # Format: rclone [-v] serve webdav <remote:path> [--addr ...]
-        if sys.platform == "win32":
-            # Windows: only double quotes, case-insensitive
-            pattern = rf'serve\s+webdav\s+"?({escaped_path})"?(?:\s|$)'
-            flags = re.IGNORECASE
-        else:
-            # Linux/Unix: single or double quotes, case-sensitive
-            pattern = rf'serve\s+webdav\s+["\']?({escaped_path})["\']?(?:\s|$)'
-            flags = 0
-
-        return bool(re.search(pattern, cmdline, flags))
+        return _webdav_pattern(remote_path, IS_WINDOWS).search(cmdline) is not None
 
     def is_sync_already_running(self, dest_config: Dict[str, Any]) -> Tuple[bool, str]:
         """Check if a sync is already running for this destination.
@@ -894,37 +1065,42 @@ class KopiaSyncRunner:
         normalized_path = self._normalize_remote_path(remote_path)
 
         try:
-            creation_flags = 0x08000000 if sys.platform == "win32" else 0
-
-            if sys.platform == "win32":
-                # Use PowerShell Get-CimInstance (WMIC is deprecated in Windows 11)
-                result = subprocess.run(
-                    ["powershell", "-Command",
-                     "Get-CimInstance Win32_Process -Filter \"Name='rclone.exe'\" | Select-Object -ExpandProperty CommandLine"],
-                    capture_output=True,
-                    text=True,
-                    encoding='utf-8',
-                    creationflags=creation_flags
-                )
-                if result.returncode == 0:
-                    for line in result.stdout.strip().split('\n'):
-                        # Look for rclone serving this exact remote path
-                        if line.strip() and 'serve' in line.lower():
-                            if self._path_in_cmdline(line, normalized_path):
-                                return True, f"rclone already syncing to {remote_path}"
+            if IS_WINDOWS:
+                # Use PowerShell Get-CimInstance (WMIC is deprecated in Windows 11);
+                # the WQL filter drops non-serve rclone processes inside CIM
+                commands = [["powershell", "-Command",
+                             "Get-CimInstance Win32_Process -Filter \"Name='rclone.exe' AND CommandLine LIKE '%serve%'\" "
+                             "| Select-Object -ExpandProperty CommandLine"]]
             else:
-                # Unix: use ps with full command
-                result = subprocess.run(
-                    ["ps", "aux"],
-                    capture_output=True,
-                    text=True,
-                    encoding='utf-8'
-                )
-                if result.returncode == 0:
-                    for line in result.stdout.strip().split('\n'):
-                        if 'rclone' in line and 'serve' in line.lower():
-                            if self._path_in_cmdline(line, normalized_path):
+                # Unix: pgrep returns only candidate processes with their full command
+                # line (-a on Linux procps, -l with -f elsewhere; -i to ignore case like
+                # the line filter below); ps lists every command line where pgrep isn't installed
+                pgrep_flags = "-aif" if sys.platform.startswith("linux") else "-ilf"
+                commands = [["pgrep", pgrep_flags, "rclone.*serve"], ["ps", "-eo", "args"]]
+
+            for cmd in commands:
+                try:
+                    # Binary pipe: only the few candidate lines are ever decoded
+                    process = subprocess.Popen(
+                        cmd,
+                        stdout=subprocess.PIPE,
+                        stderr=subprocess.DEVNULL,
+                        **NO_WINDOW
+                    )
+                except FileNotFoundError:
+                    continue  # Try the next lister
+
+                # Stream the listing and stop at the first match instead of buffering it all
+                with process:
+                    for line in process.stdout:
+                        # Look for rclone serving this exact remote path; cheap byte
+                        # prefilter before decoding and the per-path webdav match
+                        lowered = line.lower()
+                        if b'rclone' in lowered and b'serve' in lowered:
+                            if self._path_in_cmdline(line.decode('utf-8', 'replace'), normalized_path):
+                                process.kill()
                                 return True, f"rclone already syncing to {remote_path}"
+                return False, ""
 
             return False, ""
 
@@ -973,26 +1149,28 @@ class KopiaSyncRunner:
         ]
 
         # Add required backend parameters
-        for param, prefix in zip(backend_info['required'], backend_info['cmd_prefix']):
-            cmd.append(f"{prefix}{dest_config[param]}")
+        cmd.extend([f"{prefix}{dest_config[param]}"
+                    for param, prefix in zip(backend_info['required'], backend_info['cmd_prefix'])])
 
         # Add default flags
-        cmd.append("--delete")  # Mirror behavior
+        flags = ["--delete"]  # Mirror behavior
 
         # Add --flat for cloud backends
         if dest_type in self.CLOUD_BACKENDS:
-            cmd.append("--flat")
+            flags.append("--flat")
 
         # Workaround for kopia/rclone startup detection issue:
         # Kopia detects rclone startup by parsing its stderr for specific strings.
         # Recent rclone versions may not output these by default, causing timeout.
         # --rclone-debug enables verbose rclone output that kopia can detect.
         if dest_type == 'rclone':
-            cmd.append("--rclone-debug")
+            flags.append("--rclone-debug")
 
         # Add dry-run if requested
         if dry_run:
-            cmd.append("--dry-run")
+            flags.append("--dry-run")
+
+        cmd.extend(flags)
 
         # Handle sync-args based on backend type
         # For rclone: args are passed via --rclone-args=<arg> (e.g., --tpslimit for rate limiting)
@@ -1000,8 +1178,7 @@ class KopiaSyncRunner:
         sync_args = dest_config.get('sync-args', [])
         if sync_args:
             if dest_type == 'rclone':
-                for arg in sync_args:
-                    cmd.append(f"--rclone-args={arg}")
+                cmd.extend([f"--rclone-args={arg}" for arg in sync_args])
             else:
                 cmd.extend(sync_args)
 
@@ -1034,8 +1211,10 @@ class KopiaSyncRunner:
         if is_running:
             return False, f"Skipped: {running_msg} (letting previous sync finish)"
 
-        # For rclone backend, verify remote is configured
+        # For rclone backend, verify rclone is installed and the remote is configured
         if dest_type == 'rclone':
+            if self._rclone_path is None:
+                return False, "rclone not found in PATH"
             remote_path = dest_config.get('remote-path', '')
             remote_name = remote_path.split(':')[0] if ':' in remote_path else remote_path
             if not self.check_rclone_remote_configured(remote_name):
@@ -1046,29 +1225,43 @@ class KopiaSyncRunner:
         if cmd is None or error:
             return False, error or "Unknown error building command"
 
-        # Mask password in logs
-        cmd_display = [c if not c.startswith('--password=') else '--password=***' for c in cmd]
-        logging.debug(f"Executing: {subprocess.list2cmdline(cmd_display)}")
+        # Password is masked, and only rendered if the line is logged/printed
+        cmd_display = _LazyCmdline(cmd)
+        logging.debug("Executing: %s", cmd_display)
 
         if dry_run and not quiet:
-            print(f"[DRY-RUN] Would execute: {subprocess.list2cmdline(cmd_display)}")
+            print(f"[DRY-RUN] Would execute: {cmd_display}")
 
         try:
-            creation_flags = 0x08000000 if sys.platform == "win32" else 0
-
             if quiet:
-                # Scheduled mode: capture output, hide window
-                result = subprocess.run(
+                # Scheduled mode: hide window, stream output line by line and keep
+                # only the tail for error reporting (long syncs print a lot)
+                tail: Deque[str] = deque(maxlen=64)
+                with subprocess.Popen(
                     cmd,
-                    capture_output=True,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
                     text=True,
                     encoding='utf-8',
-                    creationflags=creation_flags
-                )
-                if result.returncode == 0:
+                    errors='replace',
+                    bufsize=1,
+                    **NO_WINDOW
+                ) as process:
+                    try:
+                        for line in process.stdout:
+                            line = line.rstrip()
+                            if line:
+                                logging.debug("[sync] %s", line)
+                                tail.append(line)
+                        returncode = process.wait()
+                    except BaseException:
+                        # Don't leave kopia running (e.g. on Ctrl+C); exiting the block reaps it
+                        process.kill()
+                        raise
+                if returncode == 0:
                     return True, ""
                 else:
-                    error_msg = result.stderr.strip() or result.stdout.strip() or f"kopia exited with code {result.returncode}"
+                    error_msg = "\n".join(tail) or f"kopia exited with code {returncode}"
                     return False, error_msg
             else:
                 # Interactive mode: let output flow to terminal
@@ -1107,40 +1300,124 @@ To set up rclone:
         return f"See: kopia repository sync-to {dest_type} --help"
 
 
+# Last parsed status file, keyed by (path, mtime_ns, size)
+_STATUS_CACHE: Dict[str, Any] = {"key": None, "value": {}}
+
+
+def _read_status_cached() -> Dict[str, Any]:
+    """Return the parsed status file from the cache, re-reading it if it changed.
+
+    The returned dict is shared - callers must not mutate it.
+    """
+    try:
+        # A missing file surfaces as FileNotFoundError here - no separate exists() check
+        st = os.stat(STATUS_FILE)
+        key = (STATUS_FILE, st.st_mtime_ns, st.st_size)
+        if _STATUS_CACHE["key"] != key:
+            # Small file: read it in one call and decode the string directly
+            with open(STATUS_FILE, 'r', encoding='utf-8') as f:
+                _STATUS_CACHE["value"] = json.loads(f.read())
+            _STATUS_CACHE["key"] = key
+    except FileNotFoundError:
+        return {}
+    except (json.JSONDecodeError, IOError) as e:
+        logging.warning(f"Could not load status file: {e}")
+        return {}
+    return _STATUS_CACHE["value"]
+
+
 def _load_status_file() -> Dict[str, Any]:
     """Load the entire status file.
 
     Returns:
         Full status dict, or empty dict if file doesn't exist.
     """
-    if not os.path.exists(STATUS_FILE):
-        return {}
+    # Callers mutate what they get back before saving, so hand out a copy
+    return _copy_containers(_read_status_cached())
+
+
+@functools.lru_cache(maxsize=None)
+def _get_orjson_dumps():
+    """Return orjson.dumps, or None if orjson isn't installed (resolved once)."""
     try:
-        with open(STATUS_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except (json.JSONDecodeError, IOError) as e:
-        logging.warning(f"Could not load status file: {e}")
-        return {}
+        from orjson import dumps
+        return dumps
+    except ImportError:
+        return None
+
+
+def _encode_status(status: Dict[str, Any]) -> bytes:
+    """Encode the status dict as compact UTF-8 JSON, with orjson if available."""
+    orjson_dumps = _get_orjson_dumps()
+    if orjson_dumps is not None:
+        # Same output shape as below: compact, UTF-8, non-ASCII kept as-is
+        return orjson_dumps(status)
+    return json.dumps(status, separators=(",", ":"), ensure_ascii=False).encode('utf-8')
 
 
 def _save_status_file(status: Dict[str, Any]) -> None:
-    """Save status file atomically (write to temp, then rename).
+    """Save status file atomically (write and fsync temp, then rename).
 
     Args:
         status: Full status dict to save.
     """
+    # Encode before opening anything, so the temp file is only open for one write.
+    # Compact: machine-read file, indent would only add encode time and bytes
+    payload = _encode_status(status)
+
+    temp_file = None
+    # Until the new file is in place, force the next load to re-read
+    _STATUS_CACHE["key"] = None
     try:
-        # Write to temp file first
-        temp_file = STATUS_FILE + ".tmp"
-        with open(temp_file, 'w', encoding='utf-8') as f:
-            json.dump(status, f, indent=2)
-        # Atomic rename (on Windows, need to remove target first)
-        if sys.platform == "win32" and os.path.exists(STATUS_FILE):
-            os.replace(temp_file, STATUS_FILE)
-        else:
-            os.rename(temp_file, STATUS_FILE)
+        # Write to a unique temp file first, so concurrent savers (e.g. backup
+        # and health check) can't clobber each other's half-written file
+        fd, temp_file = tempfile.mkstemp(
+            prefix=".kopia-helpers-status.", suffix=".tmp",
+            dir=os.path.dirname(STATUS_FILE) or "."
+        )
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+            # Make sure the data is on disk before the rename publishes it
+            f.flush()
+            os.fsync(f.fileno())
+            # The rename keeps mtime/size, so this is the key the file will have
+            st = os.fstat(f.fileno())
+        # Atomic rename; os.replace overwrites an existing target on all platforms
+        os.replace(temp_file, STATUS_FILE)
+        temp_file = None
+        # Seed the cache with what was just written, so the next load (e.g. a
+        # status lookup right after an update) needn't read and parse it back.
+        # If another process replaces the file, its key differs and we re-read.
+        _STATUS_CACHE["value"] = _copy_containers(status)
+        _STATUS_CACHE["key"] = (STATUS_FILE, st.st_mtime_ns, st.st_size)
     except IOError as e:
         logging.error(f"Could not save status file: {e}")
+    finally:
+        if temp_file is not None:
+            try:
+                os.unlink(temp_file)
+            except OSError:
+                pass
+
+
+@contextlib.contextmanager
+def status_transaction() -> Iterator[Dict[str, Any]]:
+    """Load the status file once, let the caller mutate it, and save once on exit.
+
+    Pass the yielded dict as `status=` to the update helpers to batch several
+    changes into a single write. Nothing is saved if the block raises or
+    leaves the status unchanged (e.g. a cleanup whose entries were re-added).
+
+    Example:
+        with status_transaction() as status:
+            update_cloud_sync_status(repo, dest, True, status=status)
+            cleanup_status_file(names, status=status)
+    """
+    status = _load_status_file()
+    before = _copy_containers(status)
+    yield status
+    if status != before:
+        _save_status_file(status)
 
 
 def load_cloud_sync_status() -> Dict[str, Any]:
@@ -1157,7 +1434,8 @@ def update_cloud_sync_status(
     repo_name: str,
     dest_id: str,
     success: bool,
-    error: Optional[str] = None
+    error: Optional[str] = None,
+    status: Optional[Dict[str, Any]] = None
 ) -> None:
     """Update the cloud sync status for a repository destination.
 
@@ -1166,20 +1444,29 @@ def update_cloud_sync_status(
         dest_id: Destination identifier (e.g., 'rclone:onedrive:mybackups')
         success: Whether the sync succeeded
         error: Error message if sync failed
+        status: Status dict from status_transaction() to update in place.
+                If None, the status file is loaded and saved immediately.
     """
-    status = _load_status_file()
+    own_status = status is None
+    if own_status:
+        status = _load_status_file()
     if "cloud_sync" not in status:
         status["cloud_sync"] = {}
 
     # Key is now repo_name:dest_id to support multiple destinations
     key = f"{repo_name}:{dest_id}"
+    # Epoch lets the interval check skip datetime parsing; ISO kept for humans/health check
+    now_epoch = time.time()
     status["cloud_sync"][key] = {
-        "last_sync": datetime.now(timezone.utc).isoformat(),
+        # ISO-8601 UTC to whole seconds (no microseconds); fromisoformat() still parses it
+        "last_sync": time.strftime("%Y-%m-%dT%H:%M:%S+00:00", time.gmtime(now_epoch)),
+        "last_sync_epoch": now_epoch,
         "success": success,
         "dest_id": dest_id,
         "error": error
     }
-    _save_status_file(status)
+    if own_status:
+        _save_status_file(status)
 
 
 def get_sync_status_for_destination(repo_name: str, dest_id: str) -> Optional[Dict[str, Any]]:
@@ -1192,27 +1479,55 @@ def get_sync_status_for_destination(repo_name: str, dest_id: str) -> Optional[Di
     Returns:
         Status dict or None if not found.
     """
-    cloud_status = load_cloud_sync_status()
-    key = f"{repo_name}:{dest_id}"
-    return cloud_status.get(key)
+    # Index the cached parse directly and copy just this entry
+    entry = _read_status_cached().get("cloud_sync", {}).get(f"{repo_name}:{dest_id}")
+    return _copy_containers(entry) if entry is not None else None
+
 
+def get_repo_sync_status(repo_name: str) -> Dict[str, Dict[str, Any]]:
+    """Get the sync status of every destination recorded for a repository.
 
-def cleanup_status_file(valid_repo_names: List[str]) -> None:
+    Args:
+        repo_name: Name of the repository
+
+    Returns:
+        Dict mapping dest_id to its status dict (empty if none recorded).
+    """
+    prefix = f"{repo_name}:"
+    cloud_status = _read_status_cached().get("cloud_sync", {})
+    return {
+        key[len(prefix):]: _copy_containers(entry)
+        for key, entry in cloud_status.items()
+        if key.startswith(prefix)
+    }
+
+
+def cleanup_status_file(valid_repo_names: Iterable[str], status: Optional[Dict[str, Any]] = None) -> None:
     """Remove status entries for repos that no longer exist in config.
 
     Args:
-        valid_repo_names: List of repo names currently in config.
+        valid_repo_names: Repo names currently in config (any iterable, e.g. a set).
+        status: Status dict from status_transaction() to clean in place.
+                If None, the status file is loaded (and saved if anything changed).
     """
-    status = _load_status_file()
+    # Materialize once - a set for the per-key membership test below
+    valid_repo_names = frozenset(valid_repo_names)
+    own_status = status is None
+    if own_status:
+        status = _load_status_file()
     changed = False
 
     if "cloud_sync" in status:
-        # Keys are composite: "repo_name:dest_id" - check if repo_name prefix is valid
+        # Keys are composite: "repo_name:dest_id" - check if repo_name prefix is valid.
+        # Names that themselves contain ':' (normally none) need the prefix scan.
+        colon_names = [f"{name}:" for name in valid_repo_names if ':' in name]
+
         def is_valid_key(key: str) -> bool:
-            for repo_name in valid_repo_names:
-                if key == repo_name or key.startswith(f"{repo_name}:"):
-                    return True
-            return False
+            # (a bare "repo_name" key partitions to itself, or matches whole
+            # when the name contains ':')
+            return (key.partition(':')[0] in valid_repo_names
+                    or key in valid_repo_names
+                    or any(key.startswith(prefix) for prefix in colon_names))
 
         stale_keys = [key for key in status["cloud_sync"] if not is_valid_key(key)]
         for key in stale_keys:
@@ -1220,5 +1535,76 @@ def cleanup_status_file(valid_repo_names: List[str]) -> None:
             logging.debug(f"Cleaned up stale status for '{key}'")
             changed = True
 
-    if changed:
+    if changed and own_status:
+        _save_status_file(status)
+
+
+# How long a passing preflight verdict stays valid (seconds)
+PREFLIGHT_CACHE_TTL = 3600
+
+
+def get_preflight_cache_key(config: Dict[str, Any], config_path: Optional[str] = None) -> str:
+    """Build a key identifying the inputs that preflight checks depend on.
+
+    Covers the config and .env file mtimes, which KOPIA_PASSWORD* variables
+    are set, where kopia/rclone resolve on PATH, and the repos being checked.
+
+    Args:
+        config: Loaded configuration dict (after any --repo filtering)
+        config_path: Path to the config file (default: CONFIG_FILE)
+
+    Returns:
+        Hex digest that changes whenever any of those inputs change.
+    """
+    def mtime(path: str) -> float:
+        try:
+            return os.path.getmtime(path)
+        except OSError:
+            return 0.0
+
+    parts = [
+        str(mtime(config_path or CONFIG_FILE)),
+        str(mtime(os.path.join(SCRIPT_DIR, '.env.local'))),
+        str(mtime(os.path.join(SCRIPT_DIR, '.env'))),
+        # Only names, never password values
+        ",".join(sorted(k for k in os.environ if k.startswith('KOPIA_PASSWORD'))),
+        str(shutil.which(KOPIA_EXE)),
+        str(shutil.which(RCLONE_EXE)),
+        ",".join(sorted(r.get('name', '') for r in config.get('repositories', []))),
+    ]
+    return hashlib.sha256("|".join(parts).encode('utf-8')).hexdigest()
+
+
+def is_preflight_cached(key: str) -> bool:
+    """Check whether preflight passed recently with the same inputs.
+
+    Args:
+        key: Key from get_preflight_cache_key()
+
+    Returns:
+        True if a passing verdict for this key is younger than PREFLIGHT_CACHE_TTL.
+    """
+    cached = _load_status_file().get("preflight") or {}
+    if cached.get("key") != key or not cached.get("ok"):
+        return False
+    try:
+        return time.time() - float(cached.get("ts", 0)) < PREFLIGHT_CACHE_TTL
+    except (TypeError, ValueError):
+        return False
+
+
+def save_preflight_result(key: str, ok: bool, status: Optional[Dict[str, Any]] = None) -> None:
+    """Record a preflight verdict so later runs can skip the checks.
+
+    Args:
+        key: Key from get_preflight_cache_key()
+        ok: Whether all checks passed
+        status: Status dict from status_transaction() to update in place.
+                If None, the status file is loaded and saved immediately.
+    """
+    own_status = status is None
+    if own_status:
+        status = _load_status_file()
+    status["preflight"] = {"key": key, "ok": ok, "ts": time.time()}
+    if own_status:
         _save_status_file(status)
@@ -2,25 +2,50 @@ import pytest
 import os
 import sys
 import shutil
-import tempfile
+import itertools
 import subprocess
 from unittest.mock import MagicMock, patch
 
-# Add parent directory to path so we can import kopia_utils
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# This directory (for the shared helpers module) and the repository root
+# (kopia_utils and the kopia-*.py scripts). Added to sys.path once, for every
+# test module (conftest is imported first), whatever pytest's import mode.
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if TESTS_DIR not in sys.path:
+    sys.path.insert(0, TESTS_DIR)
+
+from helpers import ROOT, import_script
+
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
 
 import kopia_utils as utils
 
+def pytest_configure(config):
+    config.addinivalue_line("markers", "slow: runs the real kopia binary")
+
+@pytest.fixture(scope="session")
+def _repo_root(tmp_path_factory):
+    """One temp directory for the whole session, under pytest's basetemp.
+
+    pytest prunes old basetemps itself (and --basetemp can point at a tmpfs),
+    so nothing is removed here.
+    """
+    return str(tmp_path_factory.mktemp("kopia_test"))
+
+_repo_counter = itertools.count()
+
 @pytest.fixture
-def temp_repo():
+def temp_repo(_repo_root):
     """Create a temporary directory for a Kopia repository."""
-    temp_dir = tempfile.mkdtemp(prefix="kopia_test_repo_")
+    temp_dir = os.path.join(_repo_root, f"t{next(_repo_counter)}")
     repo_path = os.path.join(temp_dir, "repo")
     config_file = os.path.join(temp_dir, "repository.config")
     source_dir = os.path.join(temp_dir, "source")
     
-    os.makedirs(repo_path)
-    os.makedirs(source_dir)
+    # The session root already exists, so plain mkdir calls suffice (no makedirs stat walk)
+    os.mkdir(temp_dir)
+    os.mkdir(repo_path)
+    os.mkdir(source_dir)
     
     repo_config = {
         'name': 'test-repo',
@@ -37,9 +62,80 @@ def temp_repo():
         'source_dir': source_dir,
         'config': repo_config
     }
+
+@pytest.fixture(scope="session")
+def _seed_repo(_repo_root):
+    """Create one Kopia repository per session for tests to copy.
+
+    Returns the repository directory, or None if it could not be created
+    (e.g. kopia is missing) - tests then create their own as before.
+    """
+    seed_dir = os.path.join(_repo_root, "seed")
+    repo_config = {
+        'name': 'test-repo',
+        'repo_destination': os.path.join(seed_dir, "repo"),
+        'repo_config': os.path.join(seed_dir, "repository.config"),
+        'repo_password': 'test-password',
+        'sources': []
+    }
+    kopia_start = import_script("kopia-start-backups.py")
+    if not kopia_start.ensure_repository_connected(utils.KopiaRunner(skip_config=True), repo_config):
+        return None
+    return repo_config['repo_destination']
+
+@pytest.fixture
+def seeded_repo(temp_repo, _seed_repo):
+    """temp_repo whose repo_path already holds an initialized repository.
+
+    Copying the session's seed repository means the test only has to connect
+    to it, instead of paying for a full `repository create` each time.
+    """
+    if _seed_repo is not None:
+        shutil.copytree(_seed_repo, temp_repo['repo_path'], dirs_exist_ok=True)
+    return temp_repo
+
+def _replay_key(args):
+    """Normalize a kopia argv for replay lookup: drop --config-file and its value."""
+    key = []
+    skip_next = False
+    for arg in args:
+        if skip_next:
+            skip_next = False
+        elif arg == "--config-file":
+            skip_next = True
+        elif not arg.startswith("--config-file="):
+            key.append(arg)
+    return tuple(key)
+
+@pytest.fixture
+def kopia_replay(monkeypatch):
+    """Answer KopiaRunner.run from canned output instead of running kopia.
+
+    Returns a dict to fill with {argv tuple (without --config-file): stdout}.
+    Calls with no canned entry fail, like a kopia error would.
+    """
+    canned = {}
     
-    # Cleanup
-    shutil.rmtree(temp_dir)
+    def fake_run(self, args, *run_args, **run_kwargs):
+        stdout = canned.get(_replay_key(args))
+        if stdout is None:
+            return False, "", f"no canned kopia output for {_replay_key(args)}", None
+        return True, stdout, "", None
+        
+    monkeypatch.setattr(utils.KopiaRunner, "run", fake_run)
+    return canned
+
+# Programs whose calls are blocked, keyed by executable name (no path, no .exe).
+# The value decides from the full argv whether this particular call is mocked.
+_MOCKED_PROGRAMS = {
+    # Task Scheduler: every call
+    "schtasks": lambda cmd: True,
+    # PowerShell: only toast notifications
+    "powershell": lambda cmd: any("ToastNotification" in arg for arg in cmd[1:]),
+}
+
+# Shared result for every mocked call (callers only read returncode/stdout/stderr)
+_FAKE_OK = subprocess.CompletedProcess((), 0, stdout="SUCCESS", stderr="")
 
 @pytest.fixture(autouse=True)
 def mock_subprocess(monkeypatch):
@@ -47,22 +143,17 @@ def mock_subprocess(monkeypatch):
     original_run = subprocess.run
     
     def side_effect(args, **kwargs):
-        cmd = args if isinstance(args, list) else args.split()
-        cmd_str = " ".join(cmd)
-        
-        # Block Task Scheduler commands
-        if "schtasks" in cmd_str:
-            print(f"MOCKED: {cmd_str}")
-            return subprocess.CompletedProcess(args, 0, stdout="SUCCESS", stderr="")
-            
-        # Block PowerShell Toast Notifications
-        if "powershell" in cmd_str and "ToastNotification" in cmd_str:
-            print(f"MOCKED TOAST: {cmd_str}")
-            return subprocess.CompletedProcess(args, 0, stdout="SUCCESS", stderr="")
-            
-        # Allow Kopia commands (we want to test them against temp repos)
-        if "kopia" in cmd_str or cmd[0].endswith("kopia.exe") or cmd[0] == "kopia":
+        # argv lists/tuples are inspected as-is; only a command string needs splitting
+        cmd = args.split() if isinstance(args, str) else args
+        if not cmd:
             return original_run(args, **kwargs)
+        program = os.path.splitext(os.path.basename(str(cmd[0])))[0].lower()
+        
+        # One dict lookup by program name; everything else (kopia included) runs for real
+        should_mock = _MOCKED_PROGRAMS.get(program)
+        if should_mock is not None and should_mock(cmd):
+            print(f"MOCKED: {program}")
+            return _FAKE_OK
             
         return original_run(args, **kwargs)
         
@@ -0,0 +1,20 @@
+"""Shared test helpers, importable from test modules and conftest alike."""
+import os
+import sys
+import functools
+import importlib.util
+
+# Repository root: kopia_utils and the kopia-*.py scripts live here
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@functools.lru_cache(maxsize=None)
+def import_script(name):
+    """Import a hyphenated script (e.g. kopia-find-files.py) as a module, once per session."""
+    file_path = os.path.join(ROOT, name)
+    module_name = "_kopia_script_" + os.path.splitext(name)[0].replace("-", "_")
+    spec = importlib.util.spec_from_file_location(module_name, file_path)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
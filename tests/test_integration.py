@@ -1,37 +1,29 @@
 import pytest
 import os
 import sys
+import json
+from pathlib import Path
 import kopia_utils as utils
-
-# Import scripts
-import importlib.util
-def import_script(name):
-    file_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), name)
-    spec = importlib.util.spec_from_file_location("module.name", file_path)
-    assert spec is not None and spec.loader is not None
-    module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(module)
-    return module
+from helpers import import_script
 
 kopia_start = import_script("kopia-start-backups.py")
 kopia_find = import_script("kopia-find-files.py")
 
+@pytest.mark.slow
 class TestIntegration:
-    def test_backup_lifecycle(self, temp_repo):
+    def test_backup_lifecycle(self, seeded_repo):
         """Test init, backup, and find flow."""
         runner = utils.KopiaRunner(skip_config=True)
-        repo_config = temp_repo['config']
-        source_dir = temp_repo['source_dir']
+        repo_config = seeded_repo['config']
+        source_dir = seeded_repo['source_dir']
         
         # 1. Create a file in source
         test_file = os.path.join(source_dir, "test_doc.txt")
-        with open(test_file, "w") as f:
-            f.write("Hello Kopia")
+        Path(test_file).write_bytes(b"Hello Kopia")
             
-        # 2. Run Backup (this should init repo and snapshot)
-        # We use ensure_repository_connected to init
+        # 2. Run Backup (connects to the copy of the pre-initialized seeded repo)
         connected = kopia_start.ensure_repository_connected(runner, repo_config)
-        assert connected, "Failed to connect/init repository"
+        assert connected, "Failed to connect to repository"
         
         # Run actual backup
         kopia_start.run_backup_job(runner, repo_config)
@@ -50,21 +42,21 @@ class TestIntegration:
         assert matches[0]['path'].endswith("test_doc.txt")
         assert matches[0]['size'] == 11  # "Hello Kopia" is 11 bytes
 
-    def test_incremental_backup(self, temp_repo):
+    def test_incremental_backup(self, seeded_repo):
         runner = utils.KopiaRunner(skip_config=True)
-        repo_config = temp_repo['config']
-        source_dir = temp_repo['source_dir']
+        repo_config = seeded_repo['config']
+        source_dir = seeded_repo['source_dir']
         
         # Init
         kopia_start.ensure_repository_connected(runner, repo_config)
         
         # 1. First backup
         file1 = os.path.join(source_dir, "file1.txt")
-        with open(file1, "w") as f: f.write("v1")
+        Path(file1).write_bytes(b"v1")
         kopia_start.run_backup_job(runner, repo_config)
         
         # 2. Modify file
-        with open(file1, "w") as f: f.write("v2-modified")
+        Path(file1).write_bytes(b"v2-modified")
         kopia_start.run_backup_job(runner, repo_config)
         
         # 3. Find versions
@@ -72,3 +64,39 @@ class TestIntegration:
         assert len(matches) == 2
         sizes = sorted([m['size'] for m in matches])
         assert sizes == [2, 11]  # v1=2 bytes, v2=11 bytes
+
+
+class TestConnectReplay:
+    """ensure_repository_connected against canned kopia output."""
+
+    def test_connects_once_per_runner(self, temp_repo, kopia_replay):
+        kopia_replay[("repository", "status")] = "Config file: repository.config\n"
+        runner = utils.KopiaRunner(skip_config=True)
+
+        assert kopia_start.ensure_repository_connected(runner, temp_repo['config'])
+        # Any further kopia call would now fail - the second check must not make one
+        kopia_replay.clear()
+        assert kopia_start.ensure_repository_connected(runner, temp_repo['config'])
+
+
+class TestFindReplay:
+    """find_in_repo against canned kopia output (no kopia binary needed)."""
+
+    def test_find_versions(self, temp_repo, kopia_replay):
+        kopia_replay[("snapshot", "list", "--json")] = json.dumps([
+            {"id": "snap1", "startTime": "2025-11-22T05:08:53Z"},
+            {"id": "snap2", "startTime": "2025-11-23T05:08:53Z"},
+        ])
+        kopia_replay[("ls", "-l", "--no-human-readable", "-r", "snap1")] = (
+            "-rw-rw-rw-   2 2025-11-22 16:08:50 AEDT 749004d41187bf2322037fecbb5022af   file1.txt\n"
+        )
+        kopia_replay[("ls", "-l", "--no-human-readable", "-r", "snap2")] = (
+            "-rw-rw-rw-   11 2025-11-23 16:08:50 AEDT 8a1f0c2d41187bf2322037fecbb5022b   file1.txt\n"
+            "-rw-rw-rw-   5 2025-11-23 16:08:51 AEDT 9b2e1d3c41187bf2322037fecbb5022c   other.txt\n"
+        )
+        runner = utils.KopiaRunner(skip_config=True)
+
+        matches = kopia_find.find_in_repo(runner, temp_repo['config'], "file1.txt")
+        assert [m['size'] for m in matches] == [11, 2]  # newest snapshot first
+        assert [m['snapshot_id'] for m in matches] == ["snap2", "snap1"]
+        assert matches[0]['modified_str'] == "2025-11-23 16:08:50 AEDT"
@@ -1,23 +1,16 @@
 import pytest
 import os
-import sys
-import importlib.util
 from datetime import datetime
 
-# Import kopia_utils
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# kopia_utils is importable via the repo root conftest.py puts on sys.path
 import kopia_utils as utils
 
 # Dynamically import scripts to test their parsing logic
-def import_script(name):
-    file_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), name)
-    spec = importlib.util.spec_from_file_location("module.name", file_path)
-    module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(module)
-    return module
+from helpers import import_script
 
 kopia_health = import_script("kopia-health-check.py")
 kopia_find = import_script("kopia-find-files.py")
+kopia_start = import_script("kopia-start-backups.py")
 
 class TestUtils:
     def test_format_timestamp_utc(self):
@@ -36,18 +29,89 @@ class TestUtils:
         clean_simple = utils.format_kopia_verbose_timestamp(ts_simple)
         assert clean_simple == "2025-11-22 16:09:30 +1100"
 
-    def test_get_password(self):
+    def test_get_password(self, monkeypatch):
         runner = utils.KopiaRunner(skip_config=True)
         
         # Test explicit config
         config = {'name': 'test', 'repo_password': 'explicit-pass'}
         assert runner.get_password(config) == 'explicit-pass'
         
-        # Test ENV var
-        os.environ['KOPIA_PASSWORD_TEST_REPO'] = 'env-pass'
+        # Test ENV var (monkeypatch restores the environment even if an assert fails)
+        monkeypatch.setenv('KOPIA_PASSWORD_TEST_REPO', 'env-pass')
         config_env = {'name': 'test-repo'}
         assert runner.get_password(config_env) == 'env-pass'
-        del os.environ['KOPIA_PASSWORD_TEST_REPO']
+
+    def test_preflight_cache(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(utils, 'STATUS_FILE', str(tmp_path / "status.json"))
+        config = {'repositories': [{'name': 'test-repo'}]}
+        key = utils.get_preflight_cache_key(config)
+        assert not utils.is_preflight_cached(key)
+
+        utils.save_preflight_result(key, True)
+        assert utils.is_preflight_cached(key)
+
+        # Different repo set -> different key -> cache miss
+        other_key = utils.get_preflight_cache_key({'repositories': [{'name': 'other'}]})
+        assert other_key != key
+        assert not utils.is_preflight_cached(other_key)
+
+        # Failed verdicts are never reused
+        utils.save_preflight_result(key, False)
+        assert not utils.is_preflight_cached(key)
+
+    def test_status_cache(self, tmp_path, monkeypatch):
+        status_file = tmp_path / "status.json"
+        monkeypatch.setattr(utils, 'STATUS_FILE', str(status_file))
+        utils.update_cloud_sync_status('docs', 'rclone:od', True)
+
+        # Read straight from the cache the save seeded
+        entry = utils.get_sync_status_for_destination('docs', 'rclone:od')
+        assert entry['success'] is True
+        assert entry['dest_id'] == 'rclone:od'
+
+        # Callers get their own copy, never the cached entry
+        entry['success'] = False
+        assert utils.get_sync_status_for_destination('docs', 'rclone:od')['success'] is True
+
+        # Another process rewriting the file invalidates the cache
+        stat = status_file.stat()
+        status_file.write_text('{"cloud_sync": {"docs:rclone:od": {"success": false, "error": "boom"}}}',
+                               encoding='utf-8')
+        os.utime(status_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert utils.get_sync_status_for_destination('docs', 'rclone:od') == {'success': False, 'error': 'boom'}
+
+    def test_status_transaction(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(utils, 'STATUS_FILE', str(tmp_path / "status.json"))
+        utils.update_cloud_sync_status('docs', 'rclone:od', True)
+        saves = []
+        monkeypatch.setattr(utils, '_save_status_file', saves.append)
+
+        # Nothing stale to clean -> status unchanged -> no write
+        with utils.status_transaction() as status:
+            utils.cleanup_status_file({'docs'}, status=status)
+        assert saves == []
+
+        # A block that raises discards its changes
+        with pytest.raises(RuntimeError):
+            with utils.status_transaction() as status:
+                utils.cleanup_status_file(set(), status=status)
+                raise RuntimeError("interrupted")
+        assert saves == []
+        assert utils.get_sync_status_for_destination('docs', 'rclone:od') is not None
+
+        # A real change is saved once
+        with utils.status_transaction() as status:
+            utils.cleanup_status_file(set(), status=status)
+            utils.save_preflight_result('key', True, status=status)
+        assert len(saves) == 1
+        assert saves[0]['cloud_sync'] == {}
+        assert saves[0]['preflight']['key'] == 'key'
+
+    def test_cleanup_status_file(self):
+        status = {'cloud_sync': {'a:x': 1, 'b:y': 2, 'a': 3, 'c:d:e': 4, 'c:z': 5, 'c:d': 6}}
+        # 'b' is stale; 'c:d' contains ':' so only its own keys (bare or "c:d:") survive
+        utils.cleanup_status_file({'a', 'c:d'}, status=status)
+        assert status == {'cloud_sync': {'a:x': 1, 'a': 3, 'c:d:e': 4, 'c:d': 6}}
 
 class TestParsing:
     def test_parse_diff_line_changed(self):
@@ -80,137 +144,120 @@ class TestParsing:
         assert modified_str == "2025-11-22 21:39:58 AEDT"
         assert path == "kopia/file.py"
 
+    @pytest.mark.parametrize("stderr,expected", [
+        ("No password found for repository 'docs'", 'no_password'),
+        ("ERROR error connecting to repository: invalid repository password", 'bad_password'),
+        ("ERROR repository not initialized in the provided storage", 'not_init'),
+        ("ERROR unable to list blobs: connection reset by peer", 'other'),
+    ])
+    def test_classify_kopia_error(self, stderr, expected):
+        assert kopia_start._classify_kopia_error(stderr) == expected
 
-class TestSyncRunner:
-    """Tests for KopiaSyncRunner sync command building."""
 
-    def test_build_sync_command_rclone_has_debug_flag(self):
-        """Verify --rclone-debug is added for rclone backends (kopia#2573 workaround)."""
-        runner = utils.KopiaSyncRunner()
-        config = {'type': 'rclone', 'remote-path': 'onedrive:test/path'}
-        cmd, err = runner.build_sync_command(config, 'test.config', 'secret')
+@pytest.fixture(scope="module")
+def sync_runner():
+    """One KopiaSyncRunner shared by the TestSyncRunner tests."""
+    return utils.KopiaSyncRunner()
 
-        assert err is None
-        assert '--rclone-debug' in cmd
-        assert 'rclone' in cmd
-        assert '--remote-path=onedrive:test/path' in cmd
-
-    def test_build_sync_command_rclone_sync_args(self):
-        """Verify sync-args for rclone are passed via --rclone-args=<arg>."""
-        runner = utils.KopiaSyncRunner()
-        config = {
-            'type': 'rclone',
-            'remote-path': 'onedrive:test/path',
-            'sync-args': ['--tpslimit=8', '--tpslimit-burst=8']
-        }
-        cmd, err = runner.build_sync_command(config, 'test.config', 'secret')
 
-        assert err is None
-        # Verify args are passed via --rclone-args=<arg> format
-        assert '--rclone-args=--tpslimit=8' in cmd
-        assert '--rclone-args=--tpslimit-burst=8' in cmd
-
-    def test_build_sync_command_filesystem_no_rclone_debug(self):
-        """Verify --rclone-debug is NOT added for non-rclone backends."""
-        runner = utils.KopiaSyncRunner()
-        config = {'type': 'filesystem', 'path': '/backup/path'}
-        cmd, err = runner.build_sync_command(config, 'test.config', 'secret')
-
-        assert err is None
-        assert '--rclone-debug' not in cmd
-        assert 'filesystem' in cmd
-
-    def test_build_sync_command_filesystem_sync_args(self):
-        """Verify sync-args for non-rclone backends go directly to kopia."""
-        runner = utils.KopiaSyncRunner()
-        config = {
-            'type': 'filesystem',
-            'path': '/backup/path',
-            'sync-args': ['--parallel=4']
-        }
-        cmd, err = runner.build_sync_command(config, 'test.config', 'secret')
-
-        assert err is None
-        # Verify arg goes directly to kopia (not via --rclone-args)
-        assert '--parallel=4' in cmd
-        assert '--rclone-args' not in cmd
+class TestSyncRunner:
+    """Tests for KopiaSyncRunner sync command building."""
 
-    def test_build_sync_command_has_delete_and_flat(self):
-        """Verify cloud backends get --delete and --flat flags."""
-        runner = utils.KopiaSyncRunner()
-        config = {'type': 'rclone', 'remote-path': 'onedrive:test'}
-        cmd, err = runner.build_sync_command(config, 'test.config', 'secret')
+    @pytest.mark.parametrize("config,present,absent", [
+        # --rclone-debug is added for rclone backends (kopia#2573 workaround)
+        pytest.param({'type': 'rclone', 'remote-path': 'onedrive:test/path'},
+                     ['--rclone-debug', 'rclone', '--remote-path=onedrive:test/path'], [],
+                     id="rclone_has_debug_flag"),
+        # sync-args for rclone are passed via --rclone-args=<arg>
+        pytest.param({'type': 'rclone', 'remote-path': 'onedrive:test/path',
+                      'sync-args': ['--tpslimit=8', '--tpslimit-burst=8']},
+                     ['--rclone-args=--tpslimit=8', '--rclone-args=--tpslimit-burst=8'], [],
+                     id="rclone_sync_args"),
+        # --rclone-debug is NOT added for non-rclone backends
+        pytest.param({'type': 'filesystem', 'path': '/backup/path'},
+                     ['filesystem'], ['--rclone-debug'],
+                     id="filesystem_no_rclone_debug"),
+        # sync-args for non-rclone backends go directly to kopia (not via --rclone-args)
+        pytest.param({'type': 'filesystem', 'path': '/backup/path', 'sync-args': ['--parallel=4']},
+                     ['--parallel=4'], ['--rclone-args'],
+                     id="filesystem_sync_args"),
+        # cloud backends get --delete and --flat flags
+        pytest.param({'type': 'rclone', 'remote-path': 'onedrive:test'},
+                     ['--delete', '--flat'], [],
+                     id="has_delete_and_flat"),
+    ])
+    def test_build_sync_command(self, sync_runner, config, present, absent):
+        """Verify the backend-specific flags build_sync_command emits."""
+        cmd, err = sync_runner.build_sync_command(config, 'test.config', 'secret')
 
         assert err is None
-        assert '--delete' in cmd
-        assert '--flat' in cmd
+        for arg in present:
+            assert arg in cmd
+        for arg in absent:
+            assert arg not in cmd
 
-    def test_is_sync_already_running_non_rclone(self):
+    def test_is_sync_already_running_non_rclone(self, sync_runner):
         """Verify non-rclone backends are not checked for running syncs."""
-        runner = utils.KopiaSyncRunner()
         config = {'type': 'filesystem', 'path': '/backup/path'}
-        is_running, msg = runner.is_sync_already_running(config)
+        is_running, msg = sync_runner.is_sync_already_running(config)
 
         assert is_running is False
         assert msg == ""
 
-    def test_is_sync_already_running_no_process(self):
+    def test_is_sync_already_running_no_process(self, sync_runner):
         """Verify returns False when no matching rclone process is running."""
-        runner = utils.KopiaSyncRunner()
         # Use a unique path that won't match any running process
         config = {'type': 'rclone', 'remote-path': 'fake-remote-12345:nonexistent/path'}
-        is_running, msg = runner.is_sync_already_running(config)
+        is_running, msg = sync_runner.is_sync_already_running(config)
 
         assert is_running is False
 
-    def test_normalize_remote_path(self):
+    def test_normalize_remote_path(self, sync_runner):
         """Verify path normalization handles trailing slashes and quotes."""
-        runner = utils.KopiaSyncRunner()
 
         # Trailing slashes stripped
-        assert runner._normalize_remote_path('onedrive:path/') == runner._normalize_remote_path('onedrive:path')
+        assert sync_runner._normalize_remote_path('onedrive:path/') == sync_runner._normalize_remote_path('onedrive:path')
 
         # Quotes stripped
-        assert runner._normalize_remote_path('"onedrive:path"') == runner._normalize_remote_path('onedrive:path')
-        assert runner._normalize_remote_path("'onedrive:path'") == runner._normalize_remote_path('onedrive:path')
+        assert sync_runner._normalize_remote_path('"onedrive:path"') == sync_runner._normalize_remote_path('onedrive:path')
+        assert sync_runner._normalize_remote_path("'onedrive:path'") == sync_runner._normalize_remote_path('onedrive:path')
 
         # On Windows, case is normalized (case-insensitive but case-preserving filesystem)
         import sys
         if sys.platform == "win32":
-            assert runner._normalize_remote_path('OneDrive:Path') == runner._normalize_remote_path('onedrive:path')
+            assert sync_runner._normalize_remote_path('OneDrive:Path') == sync_runner._normalize_remote_path('onedrive:path')
 
-    def test_path_in_cmdline_variations(self):
+    def test_path_in_cmdline_variations(self, sync_runner):
         """Verify _path_in_cmdline handles quoted and unquoted paths."""
-        runner = utils.KopiaSyncRunner()
-        path = runner._normalize_remote_path('onedrive:mybackups/kopia')
+        path = sync_runner._normalize_remote_path('onedrive:mybackups/kopia')
 
         # Unquoted path (case may differ on Windows due to case-preserving behavior)
-        assert runner._path_in_cmdline('rclone serve webdav onedrive:mybackups/kopia --addr 127.0.0.1', path)
-        assert runner._path_in_cmdline('rclone serve webdav OneDrive:MyBackups/Kopia --addr 127.0.0.1', path)
+        assert sync_runner._path_in_cmdline('rclone serve webdav onedrive:mybackups/kopia --addr 127.0.0.1', path)
+        assert sync_runner._path_in_cmdline('rclone serve webdav OneDrive:MyBackups/Kopia --addr 127.0.0.1', path)
 
         # Path at end of line
-        assert runner._path_in_cmdline('rclone serve webdav onedrive:mybackups/kopia', path)
+        assert sync_runner._path_in_cmdline('rclone serve webdav onedrive:mybackups/kopia', path)
 
         # Quoted path
-        assert runner._path_in_cmdline('rclone serve webdav "onedrive:mybackups/kopia" --addr 127.0.0.1', path)
+        assert sync_runner._path_in_cmdline('rclone serve webdav "onedrive:mybackups/kopia" --addr 127.0.0.1', path)
 
         # Different path should NOT match
-        assert not runner._path_in_cmdline('rclone serve webdav onedrive:mybackups/other --addr', path)
+        assert not sync_runner._path_in_cmdline('rclone serve webdav onedrive:mybackups/other --addr', path)
 
         # CRITICAL: Path must NOT match if it's a PREFIX of the actual path!
         # e.g., 'onedrive:mybackups/kopia' must NOT match 'onedrive:mybackups/kopia/subdir'
-        assert not runner._path_in_cmdline('rclone serve webdav onedrive:mybackups/kopia/subdir --addr', path)
-        assert not runner._path_in_cmdline('rclone serve webdav onedrive:mybackups/kopia-other --addr', path)
+        assert not sync_runner._path_in_cmdline('rclone serve webdav onedrive:mybackups/kopia/subdir --addr', path)
+        assert not sync_runner._path_in_cmdline('rclone serve webdav onedrive:mybackups/kopia-other --addr', path)
 
         # And the reverse: subdir path should NOT match parent
-        subdir_path = runner._normalize_remote_path('onedrive:mybackups/kopia/subdir')
-        assert not runner._path_in_cmdline('rclone serve webdav onedrive:mybackups/kopia --addr', subdir_path)
+        subdir_path = sync_runner._normalize_remote_path('onedrive:mybackups/kopia/subdir')
+        assert not sync_runner._path_in_cmdline('rclone serve webdav onedrive:mybackups/kopia --addr', subdir_path)
 
         # Test with actual kopia-spawned rclone command line format
         real_cmdline = 'rclone -v serve webdav onedrive:mybackups/kopia/kopia-mysrc --addr 127.0.0.1:0 --rc --rc-addr 127.0.0.1:0'
-        real_path = runner._normalize_remote_path('onedrive:mybackups/kopia/kopia-mysrc')
-        assert runner._path_in_cmdline(real_cmdline, real_path)
+        real_path = sync_runner._normalize_remote_path('onedrive:mybackups/kopia/kopia-mysrc')
+        assert sync_runner._path_in_cmdline(real_cmdline, real_path)
 
         # Different repo should NOT match
-        other_path = runner._normalize_remote_path('onedrive:mybackups/kopia/kopia-other')
-        assert not runner._path_in_cmdline(real_cmdline, other_path)
+        other_path = sync_runner._normalize_remote_path('onedrive:mybackups/kopia/kopia-other')
+        assert not sync_runner._path_in_cmdline(real_cmdline, other_path)